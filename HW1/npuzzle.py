@@ -11,6 +11,10 @@ See Courseworks for detailed instructions.
 
 import time
 
+from collections import deque
+from heapq import heappush
+from heapq import heappop
+
 
 def state_to_string(state):
     row_strings = [" ".join([str(cell) for cell in row]) for row in state]
@@ -71,6 +75,28 @@ def get_successors(state):
 
     return child_states
 
+
+def get_moves(state):
+    """
+    Like get_successors, but every entry also describes the move itself: 
+    (action, state, tile, source, destination), where the tile moved from 
+    the row-major cell index source to the cell index destination (the old
+    hole). Incremental heuristics only need this to update their estimate.
+    """
+    n = len(state)
+    for i in range(n):
+        if 0 in state[i]:
+            j = state[i].index(0)
+            break
+
+    moves = []
+    blank = i * n + j
+    for action, (i2, j2) in (('Left', (i, j + 1)), ('Right', (i, j - 1)), 
+                             ('Up', (i + 1, j)), ('Down', (i - 1, j))):
+        if 0 <= i2 < n and 0 <= j2 < n:
+            moves.append((action, swap_cells(state, i, j, i2, j2), state[i2][j2], i2 * n + j2, blank))
+    return moves
+
             
 def goal_test(state):
     """
@@ -94,8 +120,184 @@ def goal_test(state):
 
     return True
 
+
+def is_solvable(state, puzzle=None):
+    """
+    Returns True if the goal can be reached from state. 
+    Every move swaps the hole with a neighbouring tile, which flips both the
+    parity of the permutation of the cells and the parity of the hole's 
+    Manhattan distance to its goal position (the top left corner). The two
+    parities are equal in the goal, so they must be equal in any state that
+    can reach it.
+    If puzzle is a PackedPuzzle, state is packed. 
+    """
+    cells = [s for st in state for s in st] if puzzle is None else puzzle.cells(state)
+    n = len(state) if puzzle is None else puzzle.n
+
+    cycles = 0
+    visited = [False] * len(cells)
+    for start in range(len(cells)):
+        if not visited[start]:
+            cycles += 1
+            index = start
+            while not visited[index]:
+                visited[index] = True
+                index = cells[index]
+    permutation_parity = (len(cells) - cycles) % 2
+
+    blank_i, blank_j = divmod(cells.index(0), n)
+    return permutation_parity == (blank_i + blank_j) % 2
+
+
+def goal_state(n):
+    """
+    Returns the goal state of an n x n board as a tuple of tuples. 
+    """
+    return tuple(tuple(range(row * n, (row + 1) * n)) for row in range(n))
+
+
+class PackedPuzzle(object):
+    """
+    Compact state representation for an n x n puzzle. 
+    A state is a single int: every cell is stored in row-major order in 
+    cell_bits bits, and the index of the hole is cached in the lowest 
+    cell_bits bits, so successors are computed with a few shifts instead of
+    rebuilding and re-scanning a tuple of tuples. 
+    For example, on a 3x3 board the goal state packs to one small int. 
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.size = n * n
+        self.cell_bits = max(1, (self.size - 1).bit_length())
+        self.cell_mask = (1 << self.cell_bits) - 1
+        self.goal = self.pack(goal_state(n))
+
+        # For each hole position, the (action, neighbour) pairs in the same
+        # order as get_successors.
+        self.moves = []
+        for blank in range(self.size):
+            i, j = divmod(blank, n)
+            moves = []
+            if (j + 1) < n:
+                moves.append(('Left', blank + 1))
+            if (j - 1) >= 0:
+                moves.append(('Right', blank - 1))
+            if (i + 1) < n:
+                moves.append(('Up', blank + n))
+            if (i - 1) >= 0:
+                moves.append(('Down', blank - n))
+            self.moves.append(tuple(moves))
+
+    def shift(self, index):
+        """
+        Returns the bit offset of the cell with the given row-major index.
+        """
+        return (index + 1) * self.cell_bits
+
+    def pack(self, state):
+        """
+        Converts a tuple of tuples state into its packed int form. 
+        """
+        packed = 0
+        blank = 0
+        index = 0
+        for row in state:
+            for cell in row:
+                if cell == 0:
+                    blank = index
+                packed |= cell << self.shift(index)
+                index += 1
+        return packed | blank
+
+    def unpack(self, packed):
+        """
+        Converts a packed state back into a tuple of tuples. 
+        """
+        cells = self.cells(packed)
+        return tuple(tuple(cells[row * self.n:(row + 1) * self.n]) for row in range(self.n))
+
+    def cells(self, packed):
+        """
+        Returns the cells of a packed state as a flat row-major list.
+        """
+        packed >>= self.cell_bits
+        cells = []
+        for _ in range(self.size):
+            cells.append(packed & self.cell_mask)
+            packed >>= self.cell_bits
+        return cells
+
+    def blank(self, packed):
+        return packed & self.cell_mask
+
+    def get_successors(self, packed):
+        """
+        Same contract as get_successors, but on packed states. Each successor
+        only moves one tile and the hole, so it is built in constant time.
+        """
+        blank = packed & self.cell_mask
+        base = packed ^ blank
+        blank_shift = self.shift(blank)
+        child_states = []
+        for action, index in self.moves[blank]:
+            index_shift = self.shift(index)
+            tile = (packed >> index_shift) & self.cell_mask
+            child = base - (tile << index_shift) + (tile << blank_shift) + index
+            child_states.append((action, child))
+        return child_states
+
+    def get_moves(self, packed):
+        """
+        Same contract as get_moves, but on packed states. 
+        """
+        blank = packed & self.cell_mask
+        base = packed ^ blank
+        blank_shift = self.shift(blank)
+        moves = []
+        for action, index in self.moves[blank]:
+            index_shift = self.shift(index)
+            tile = (packed >> index_shift) & self.cell_mask
+            child = base - (tile << index_shift) + (tile << blank_shift) + index
+            moves.append((action, child, tile, index, blank))
+        return moves
+
+    def goal_test(self, packed):
+        return packed == self.goal
+
+    def heuristic(self, heuristic):
+        """
+        Adapts a heuristic written for tuple states to packed states. 
+        """
+        return lambda packed: heuristic(self.unpack(packed))
+
+
+def search_functions(puzzle):
+    """
+    Returns the successor and goal test functions the search algorithms
+    should use: the tuple based ones, or the ones of a PackedPuzzle.
+    """
+    if puzzle is None:
+        return get_successors, goal_test
+    return puzzle.get_successors, puzzle.goal_test
+
+
+def expand(state, estimate, heuristic, puzzle=None):
+    """
+    Returns the (action, child, child_estimate) triples of a state whose 
+    heuristic value is estimate. A heuristic with a delta method is updated
+    from the parent's value and the one tile that moved; any other heuristic
+    is evaluated on the whole child state.
+    """
+    if hasattr(heuristic, 'delta'):
+        moves = get_moves(state) if puzzle is None else puzzle.get_moves(state)
+        return [(action, child, estimate + heuristic.delta(tile, source, destination)) 
+                for action, child, tile, source, destination in moves]
+    successors = get_successors(state) if puzzle is None else puzzle.get_successors(state)
+    return [(action, child, heuristic(child)) for action, child in successors]
+
    
-def bfs(state):
+def bfs(state, puzzle=None):
     """
     Breadth first search.
     Returns three values: A list of actions, the number of states expanded, and
@@ -104,11 +306,15 @@ def bfs(state):
     - The fringe of nodes to expand (operating as a queue in BFS)
     - A set of closed nodes already expanded
     - A mapping (dictionary) from a given node to its parent and associated action
+    If puzzle is a PackedPuzzle, state (and every other state) is packed. 
     """
+    get_successors, goal_test = search_functions(puzzle)
     states_expanded = 0
     max_fringe = 0
+    if not is_solvable(state, puzzle):
+        return None, states_expanded, max_fringe
 
-    fringe = []
+    fringe = deque()
     closed = set()
     parents = {}
 
@@ -124,7 +330,7 @@ def bfs(state):
         if not fringe:
             return None, states_expanded, max_fringe
 
-        state_to_expand = fringe.pop(0)
+        state_to_expand = fringe.popleft()
 
         if goal_test(state_to_expand):
             return extract_solution(state_to_expand, parents), states_expanded, max_fringe
@@ -142,13 +348,76 @@ def bfs(state):
 def extract_solution(final_state, parents):
     final_solution = []
     state = final_state
-    while parents[state][0]:
+    while parents[state][0] is not None:
         final_solution.insert(0, parents[state][1])
         state = parents[state][0]
     return final_solution
 
+
+OPPOSITE_ACTIONS = {'Left': 'Right', 'Right': 'Left', 'Up': 'Down', 'Down': 'Up'}
+
+
+def bidirectional_bfs(state, puzzle=None):
+    """
+    Bidirectional breadth first search, from state and from the goal state.
+    Returns three values: A list of actions, the number of states expanded, and
+    the maximum size of the fringe (both fringes together).
+    Each step expands a whole layer of the smaller fringe. Once a layer reaches
+    a state seen by the other search, the shortest path through any state met
+    in that layer is returned. 
+    If puzzle is a PackedPuzzle, state (and every other state) is packed. 
+    """
+    get_successors, goal_test = search_functions(puzzle)
+    states_expanded = 0
+    max_fringe = 0
+    if not is_solvable(state, puzzle):
+        return None, states_expanded, max_fringe
+
+    goal = goal_state(len(state)) if puzzle is None else puzzle.goal
+    if goal_test(state):
+        return [], states_expanded, 1
+
+    forward = (deque([state]), {state: (None, None)}, {state: 0})
+    backward = (deque([goal]), {goal: (None, None)}, {goal: 0})
+
+    while forward[0] and backward[0]:
+
+        if max_fringe < len(forward[0]) + len(backward[0]):
+            max_fringe = len(forward[0]) + len(backward[0])
+
+        if len(forward[0]) <= len(backward[0]):
+            (fringe, parents, depths), (_, _, other_depths) = forward, backward
+        else:
+            (fringe, parents, depths), (_, _, other_depths) = backward, forward
+
+        best_meeting = None
+        best_length = float('inf')
+        for _ in range(len(fringe)):
+            state_to_expand = fringe.popleft()
+            states_expanded += 1
+            for action, child in get_successors(state_to_expand):
+                if child in parents:
+                    continue
+                parents[child] = (state_to_expand, action)
+                depths[child] = depths[state_to_expand] + 1
+                fringe.append(child)
+                if child in other_depths and depths[child] + other_depths[child] < best_length:
+                    best_meeting = child
+                    best_length = depths[child] + other_depths[child]
+
+        if best_meeting is not None:
+            solution = extract_solution(best_meeting, forward[1])
+            node = best_meeting
+            while backward[1][node][0] is not None:
+                parent, action = backward[1][node]
+                solution.append(OPPOSITE_ACTIONS[action])
+                node = parent
+            return solution, states_expanded, max_fringe
+
+    return None, states_expanded, max_fringe
+
      
-def dfs(state):
+def dfs(state, puzzle=None):
     """
     Depth first search.
     Returns three values: A list of actions, the number of states expanded, and
@@ -157,9 +426,13 @@ def dfs(state):
     - The fringe of nodes to expand (operating as a stack in DFS)
     - A set of closed nodes already expanded
     - A mapping (dictionary) from a given node to its parent and associated action
+    If puzzle is a PackedPuzzle, state (and every other state) is packed. 
     """
+    get_successors, goal_test = search_functions(puzzle)
     states_expanded = 0
     max_fringe = 0
+    if not is_solvable(state, puzzle):
+        return None, states_expanded, max_fringe
 
     fringe = []
     closed = set()
@@ -214,29 +487,72 @@ def manhattan_heuristic(state):
     For each misplaced tile, compute the Manhattan distance between the current
     position and the goal position. Then return the sum of all distances.
     """
-
-    i = 0
-    tiles_position = {}
-    tiles_expected_position = {}
-    tile_value = 0
+    distances = goal_distances(len(state))
+    manhattan_distance = 0
+    index = 0
     for st in state:
-        j = 0
         for s in st:
-            tiles_position[s] = (i, j)
-            tiles_expected_position[tile_value] = (i, j)
-            tile_value += 1
-            j += 1
-        i += 1
-
-    manhattan_distance = 0
-    for k, v in tiles_position.items():
-        if k:
-            manhattan_distance += abs(v[0] - tiles_expected_position[k][0]) + abs(v[1] - tiles_expected_position[k][1])
+            manhattan_distance += distances[s][index]
+            index += 1
 
     return manhattan_distance
 
 
-def best_first(state, heuristic):
+goal_distance_tables = {}  # For storing the goal distance table of each board size.
+
+
+def goal_distances(n):
+    """
+    Returns the table distances[tile][cell] of Manhattan distances between the
+    row-major cell index and the goal position of tile on an n x n board. 
+    The hole (tile 0) is not counted, so its row is all zeros.
+    """
+    if n not in goal_distance_tables:
+        table = [[0] * (n * n)]
+        for tile in range(1, n * n):
+            goal_i, goal_j = divmod(tile, n)
+            table.append([abs(cell // n - goal_i) + abs(cell % n - goal_j) for cell in range(n * n)])
+        goal_distance_tables[n] = table
+    return goal_distance_tables[n]
+
+
+class ManhattanHeuristic(object):
+    """
+    Incremental version of manhattan_heuristic for an n x n board, usable 
+    on tuple and packed states. The search functions call it once on the 
+    start state and then only add delta for the tile moved into the hole.
+    """
+
+    def __init__(self, n):
+        self.puzzle = PackedPuzzle(n)
+        self.distances = goal_distances(n)
+
+    def __call__(self, state):
+        cells = self.puzzle.cells(state) if isinstance(state, int) else [s for st in state for s in st]
+        return sum(self.distances[tile][index] for index, tile in enumerate(cells))
+
+    def delta(self, tile, source, destination):
+        row = self.distances[tile]
+        return row[destination] - row[source]
+
+
+class MisplacedHeuristic(object):
+    """
+    Incremental version of misplaced_heuristic for an n x n board. 
+    """
+
+    def __init__(self, n):
+        self.puzzle = PackedPuzzle(n)
+
+    def __call__(self, state):
+        cells = self.puzzle.cells(state) if isinstance(state, int) else [s for st in state for s in st]
+        return sum(1 for index, tile in enumerate(cells) if tile and tile != index)
+
+    def delta(self, tile, source, destination):
+        return (tile != destination) - (tile != source)
+
+
+def best_first(state, heuristic, puzzle=None):
     """
     Best first search.
     Returns three values: A list of actions, the number of states expanded, and
@@ -245,13 +561,17 @@ def best_first(state, heuristic):
     - The fringe of nodes to expand (operating as a priority queue in greedy search)
     - A set of closed nodes already expanded
     - A mapping (dictionary) from a given node to its parent and associated action
+    If puzzle is a PackedPuzzle, state (and every other state) is packed. 
     """
     # You may want to use these functions to maintain a priority queue
     from heapq import heappush
     from heapq import heappop
 
+    _, goal_test = search_functions(puzzle)
     states_expanded = 0
     max_fringe = 0
+    if not is_solvable(state, puzzle):
+        return None, states_expanded, max_fringe
 
     fringe = []
     closed = set()
@@ -269,46 +589,47 @@ def best_first(state, heuristic):
         if not fringe:
             return None, states_expanded, max_fringe
 
-        state_to_expand = heappop(fringe)[1]
+        estimate, state_to_expand = heappop(fringe)
 
         if goal_test(state_to_expand):
             return extract_solution(state_to_expand, parents), states_expanded, max_fringe
 
         if state_to_expand not in closed:
             states_expanded += 1
-            new_states = get_successors(state_to_expand)
+            new_states = expand(state_to_expand, estimate, heuristic, puzzle)
             closed.add(state_to_expand)
             for s in new_states:
                 if s[1] not in closed:
-                    heappush(fringe, (heuristic(s[1]), s[1]))
+                    heappush(fringe, (s[2], s[1]))
                     parents[s[1]] = (state_to_expand, s[0])
 
 
-def astar(state, heuristic):
+def astar(state, heuristic, puzzle=None):
     """
     A-star search.
     Returns three values: A list of actions, the number of states expanded, and
     the maximum size of the fringe.
     You may want to keep track of three mutable data structures:
-    - The fringe of nodes to expand (operating as a priority queue in greedy search)
-    - A set of closed nodes already expanded
+    - The fringe of nodes to expand (an OpenList)
+    - A mapping (dictionary) from a given node to the cost of its best known path
     - A mapping (dictionary) from a given node to its parent and associated action
+    A child is only (re)opened when it is reached by a cheaper path, so the
+    parents of expanded nodes are never overwritten by worse paths. 
+    If puzzle is a PackedPuzzle, state (and every other state) is packed. 
     """
-    # You may want to use these functions to maintain a priority queue
-    from heapq import heappush
-    from heapq import heappop
-
+    _, goal_test = search_functions(puzzle)
     states_expanded = 0
     max_fringe = 0
+    if not is_solvable(state, puzzle):
+        return None, states_expanded, max_fringe
 
-    fringe = []
-    closed = set()
+    fringe = OpenList()
     parents = {}
     costs = {}
 
     # YOUR CODE HERE
     costs[state] = 0
-    heappush(fringe, (heuristic(state) + costs[state], state))
+    fringe.push(state, 0, heuristic(state))
     parents[state] = (None, None)
 
     while True:
@@ -319,20 +640,168 @@ def astar(state, heuristic):
         if not fringe:
             return None, states_expanded, max_fringe
 
-        state_to_expand = heappop(fringe)[1]
+        state_to_expand, cost, estimate = fringe.pop()
 
         if goal_test(state_to_expand):
             return extract_solution(state_to_expand, parents), states_expanded, max_fringe
 
-        if state_to_expand not in closed:
-            states_expanded += 1
-            new_states = get_successors(state_to_expand)
-            closed.add(state_to_expand)
-            for s in new_states:
-                if s[1] not in closed:
-                    costs[s[1]] = costs[state_to_expand] + 1
-                    heappush(fringe, (heuristic(s[1]) + costs[s[1]], s[1]))
-                    parents[s[1]] = (state_to_expand, s[0])
+        states_expanded += 1
+        for action, child, child_estimate in expand(state_to_expand, estimate, heuristic, puzzle):
+            child_cost = cost + 1
+            if child not in costs or child_cost < costs[child]:
+                costs[child] = child_cost
+                parents[child] = (state_to_expand, action)
+                fringe.push(child, child_cost, child_estimate)
+
+
+class OpenList(object):
+    """
+    Priority queue of (state, cost, estimate) entries ordered by cost plus
+    estimate, with ties broken in favour of the smaller estimate. 
+    Pushing a state that is already in the queue replaces its entry; the old
+    heap entry is left behind and skipped when it reaches the top, so only 
+    live entries count towards the size of the queue. 
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.costs = {}  # Cost of the live entry of each state in the queue.
+        self.count = 0   # Insertion counter, so states are never compared.
+
+    def push(self, state, cost, estimate):
+        heappush(self.heap, (cost + estimate, estimate, self.count, state, cost))
+        self.count += 1
+        self.costs[state] = cost
+
+    def pop(self):
+        """
+        Removes and returns the (state, cost, estimate) entry with the lowest 
+        priority. 
+        """
+        while True:
+            _, estimate, _, state, cost = heappop(self.heap)
+            if self.costs.get(state) == cost:
+                del self.costs[state]
+                return state, cost, estimate
+
+    def __contains__(self, state):
+        return state in self.costs
+
+    def __len__(self):
+        return len(self.costs)
+
+
+def ida_star(state, heuristic, puzzle=None):
+    """
+    Iterative deepening A* search.
+    Returns three values: A list of actions, the number of states expanded, and
+    the maximum size of the fringe.
+    Each iteration is a depth first search that cuts off paths whose cost plus
+    heuristic exceeds a bound, which grows to the smallest cut off value. 
+    Only the current path is kept in memory, so the fringe is the path itself.
+    """
+    _, goal_test = search_functions(puzzle)
+    states_expanded = 0
+    max_fringe = 0
+    if not is_solvable(state, puzzle):
+        return None, states_expanded, max_fringe
+
+    actions = []
+    on_path = set()
+
+    def search(node, cost, estimate, bound):
+        nonlocal states_expanded, max_fringe
+        if cost + estimate > bound:
+            return cost + estimate
+        if goal_test(node):
+            return True
+
+        states_expanded += 1
+        minimum = float('inf')
+        new_states = sorted(expand(node, estimate, heuristic, puzzle), key=lambda s: s[2])
+        for action, child, child_estimate in new_states:
+            if child in on_path:
+                continue
+            on_path.add(child)
+            actions.append(action)
+            max_fringe = max(max_fringe, len(on_path))
+            result = search(child, cost + 1, child_estimate, bound)
+            if result is True:
+                return True
+            on_path.remove(child)
+            actions.pop()
+            minimum = min(minimum, result)
+        return minimum
+
+    estimate = heuristic(state)
+    bound = estimate
+    on_path.add(state)
+    while True:
+        result = search(state, 0, estimate, bound)
+        if result is True:
+            return actions, states_expanded, max_fringe
+        if result == float('inf'):
+            return None, states_expanded, max_fringe
+        bound = result
+
+
+def rbfs(state, heuristic, puzzle=None):
+    """
+    Recursive best first search, a memory-bounded variant of A*.
+    Returns three values: A list of actions, the number of states expanded, and
+    the maximum size of the fringe.
+    Only the successors of the nodes on the current path are kept, together 
+    with the best f value backed up from their forgotten subtrees, so memory is
+    linear in the depth of the solution. 
+    """
+    _, goal_test = search_functions(puzzle)
+    states_expanded = 0
+    max_fringe = 0
+    if not is_solvable(state, puzzle):
+        return None, states_expanded, max_fringe
+    fringe_size = 0
+
+    actions = []
+    on_path = set()
+
+    def search(node, cost, estimate, f_node, f_limit):
+        nonlocal states_expanded, max_fringe, fringe_size
+        if goal_test(node):
+            return True, f_node
+
+        states_expanded += 1
+        successors = []
+        for action, child, child_estimate in expand(node, estimate, heuristic, puzzle):
+            if child not in on_path:
+                f_child = max(cost + 1 + child_estimate, f_node)
+                successors.append([f_child, child_estimate, action, child])
+        if not successors:
+            return False, float('inf')
+
+        fringe_size += len(successors)
+        max_fringe = max(max_fringe, fringe_size)
+        while True:
+            successors.sort(key=lambda s: (s[0], s[1]))
+            best = successors[0]
+            if best[0] > f_limit:
+                fringe_size -= len(successors)
+                return False, best[0]
+            alternative = successors[1][0] if len(successors) > 1 else float('inf')
+
+            on_path.add(best[3])
+            actions.append(best[2])
+            found, best[0] = search(best[3], cost + 1, best[1], best[0], min(f_limit, alternative))
+            if found:
+                return True, best[0]
+            on_path.remove(best[3])
+            actions.pop()
+
+    estimate = heuristic(state)
+    on_path.add(state)
+    found, _ = search(state, 0, estimate, estimate, float('inf'))
+    if found:
+        return actions, states_expanded, max_fringe
+    return None, states_expanded, max_fringe
 
 
 def print_result(solution, states_expanded, max_fringe):
@@ -371,6 +840,16 @@ if __name__ == "__main__":
         print(solution)
     print("Total time: {0:.3f}s".format(end-start))
 
+    print()
+    print("====Bidirectional BFS====")
+    start = time.time()
+    solution, states_expanded, max_fringe = bidirectional_bfs(test_state)
+    end = time.time()
+    print_result(solution, states_expanded, max_fringe)
+    if solution is not None:
+        print(solution)
+    print("Total time: {0:.3f}s".format(end-start))
+
     print()
     print("====DFS====")
     start = time.time()
@@ -411,3 +890,34 @@ if __name__ == "__main__":
         print(solution)
     print("Total time: {0:.3f}s".format(end-start))
 
+
+    print()
+    print("====A* (Total Manhattan Distance Heuristic, packed states, incremental)====")
+    puzzle = PackedPuzzle(len(test_state))
+    start = time.time()
+    solution, states_expanded, max_fringe = astar(puzzle.pack(test_state), ManhattanHeuristic(puzzle.n), puzzle)
+    end = time.time()
+    print_result(solution, states_expanded, max_fringe)
+    if solution is not None:
+        print(solution)
+    print("Total time: {0:.3f}s".format(end-start))
+
+    print()
+    print("====IDA* (Total Manhattan Distance Heuristic, packed states, incremental)====")
+    start = time.time()
+    solution, states_expanded, max_fringe = ida_star(puzzle.pack(test_state), ManhattanHeuristic(puzzle.n), puzzle)
+    end = time.time()
+    print_result(solution, states_expanded, max_fringe)
+    if solution is not None:
+        print(solution)
+    print("Total time: {0:.3f}s".format(end-start))
+
+    print()
+    print("====RBFS (Total Manhattan Distance Heuristic, packed states, incremental)====")
+    start = time.time()
+    solution, states_expanded, max_fringe = rbfs(puzzle.pack(test_state), ManhattanHeuristic(puzzle.n), puzzle)
+    end = time.time()
+    print_result(solution, states_expanded, max_fringe)
+    if solution is not None:
+        print(solution)
+    print("Total time: {0:.3f}s".format(end-start))
@@ -0,0 +1,141 @@
+"""
+COMS W4701 Artificial Intelligence - Programming Homework 1
+
+Batch solver for the n-Puzzle. Reads a file with one puzzle per line (the
+cells in row-major order, separated by spaces; blank lines and lines
+starting with # are ignored), solves the puzzles on a process pool and
+writes one CSV row of statistics per puzzle.
+
+Usage: python npuzzle_batch.py puzzles.txt [--search astar]
+           [--heuristic manhattan] [--pdb filename] [--processes 4]
+
+@author: Naman Jain (nj2387)
+"""
+
+import argparse
+import csv
+import math
+import sys
+import time
+
+from multiprocessing import Pool
+
+import npuzzle
+
+SEARCHES = {
+    'bfs': npuzzle.bfs,
+    'bidirectional_bfs': npuzzle.bidirectional_bfs,
+    'dfs': npuzzle.dfs,
+    'best_first': npuzzle.best_first,
+    'astar': npuzzle.astar,
+    'ida_star': npuzzle.ida_star,
+    'rbfs': npuzzle.rbfs,
+}
+
+UNINFORMED_SEARCHES = ('bfs', 'bidirectional_bfs', 'dfs')
+
+HEURISTICS = {
+    'manhattan': npuzzle.ManhattanHeuristic,
+    'misplaced': npuzzle.MisplacedHeuristic,
+}
+
+FIELDS = ['index', 'solvable', 'solution_length', 'states_expanded', 'max_fringe', 'time']
+
+heuristics = {}  # For storing the heuristics already built in this process.
+
+
+def read_puzzles(filename):
+    """
+    Returns the puzzles of filename as a list of tuple of tuples states.
+    """
+    puzzles = []
+    with open(filename) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            cells = [int(cell) for cell in line.split()]
+            n = math.isqrt(len(cells))
+            if n * n != len(cells):
+                raise ValueError("Not a square board: {}".format(line))
+            puzzles.append(tuple(tuple(cells[row * n:(row + 1) * n]) for row in range(n)))
+    return puzzles
+
+
+def get_heuristic(name, n, pdb=None):
+    """
+    Returns the heuristic called name for n x n boards, building it (or
+    loading the pattern database file pdb) only once per process.
+    """
+    key = (name, n, pdb)
+    if key not in heuristics:
+        if pdb is not None:
+            from npuzzle_pdb import load_pattern_databases
+            heuristics[key] = load_pattern_databases(pdb)
+        else:
+            heuristics[key] = HEURISTICS[name](n)
+    return heuristics[key]
+
+
+def solve_instance(job):
+    """
+    Solves one puzzle on packed states and returns a dictionary of FIELDS.
+    job is an (index, state, search, heuristic, pdb) tuple.
+    """
+    index, state, search, heuristic, pdb = job
+    puzzle = npuzzle.PackedPuzzle(len(state))
+    packed = puzzle.pack(state)
+
+    start = time.time()
+    solvable = npuzzle.is_solvable(packed, puzzle)
+    if search in UNINFORMED_SEARCHES:
+        solution, states_expanded, max_fringe = SEARCHES[search](packed, puzzle)
+    else:
+        solution, states_expanded, max_fringe = SEARCHES[search](packed, get_heuristic(heuristic, puzzle.n, pdb), puzzle)
+    end = time.time()
+
+    return {
+        'index': index,
+        'solvable': solvable,
+        'solution_length': None if solution is None else len(solution),
+        'states_expanded': states_expanded,
+        'max_fringe': max_fringe,
+        'time': round(end - start, 6),
+    }
+
+
+def solve_batch(puzzles, search='astar', heuristic='manhattan', pdb=None, processes=None):
+    """
+    Solves every puzzle with the given search and returns the list of their
+    statistics, in the order of the puzzles. processes=None uses one worker
+    per CPU; processes=1 solves the puzzles in this process.
+    """
+    jobs = [(index, state, search, heuristic, pdb) for index, state in enumerate(puzzles)]
+    if processes == 1:
+        return [solve_instance(job) for job in jobs]
+    with Pool(processes) as pool:
+        return pool.map(solve_instance, jobs, chunksize=max(1, len(jobs) // (8 * (processes or 8))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a file of n-Puzzles.")
+    parser.add_argument('filename')
+    parser.add_argument('--search', choices=sorted(SEARCHES), default='astar')
+    parser.add_argument('--heuristic', choices=sorted(HEURISTICS), default='manhattan')
+    parser.add_argument('--pdb', help="pattern database file, used instead of --heuristic")
+    parser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args()
+
+    puzzles = read_puzzles(args.filename)
+    start = time.time()
+    results = solve_batch(puzzles, args.search, args.heuristic, args.pdb, args.processes)
+    end = time.time()
+
+    writer = csv.DictWriter(sys.stdout, fieldnames=FIELDS)
+    writer.writeheader()
+    writer.writerows(results)
+    sys.stderr.write("Solved {} puzzles in {:.3f}s.\n".format(len(puzzles), end - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+COMS W4701 Artificial Intelligence - Programming Homework 1
+
+Benchmark harness for the n-Puzzle searches. Generates random solvable
+instances at controlled depths (random walks from the goal that never undo
+the previous move, seeded for reproducibility), runs every selected search
+and heuristic on them, and reports nodes per second, peak memory, fringe
+size and heuristic call counts as CSV or JSON.
+
+Usage: python npuzzle_bench.py [--n 3] [--depths 10 20 30] [--instances 5]
+           [--searches astar ida_star] [--heuristics manhattan]
+           [--seed 0] [--format csv|json] [--output filename]
+
+@author: Naman Jain (nj2387)
+"""
+
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import npuzzle
+from npuzzle_batch import HEURISTICS, SEARCHES, UNINFORMED_SEARCHES
+
+FIELDS = ['n', 'depth', 'instance', 'search', 'heuristic', 'solution_length', 'states_expanded',
+          'max_fringe', 'heuristic_calls', 'heuristic_deltas', 'time', 'nodes_per_second', 'peak_memory']
+
+
+class CountingHeuristic(object):
+    """
+    Wraps a heuristic and counts its full evaluations and, for incremental
+    heuristics, its delta updates.
+    """
+
+    def __init__(self, heuristic):
+        self.heuristic = heuristic
+        self.calls = 0
+        self.deltas = 0
+        if hasattr(heuristic, 'delta'):
+            self.delta = self.counted_delta
+
+    def __call__(self, state):
+        self.calls += 1
+        return self.heuristic(state)
+
+    def counted_delta(self, tile, source, destination):
+        self.deltas += 1
+        return self.heuristic.delta(tile, source, destination)
+
+
+def random_instance(puzzle, depth, rng):
+    """
+    Returns a packed state depth random moves away from the goal. The walk
+    never undoes its previous move, so the optimal solution is at most depth
+    moves long (and usually close to it).
+    """
+    state = puzzle.goal
+    previous = None
+    for _ in range(depth):
+        moves = [(action, child) for action, child in puzzle.get_successors(state)
+                 if action != npuzzle.OPPOSITE_ACTIONS.get(previous)]
+        previous, state = rng.choice(moves)
+    return state
+
+
+def run_search(search, heuristic, state, puzzle):
+    """
+    Runs one search and returns its result and its running time.
+    """
+    start = time.perf_counter()
+    if heuristic is None:
+        result = SEARCHES[search](state, puzzle)
+    else:
+        result = SEARCHES[search](state, heuristic, puzzle)
+    return result, time.perf_counter() - start
+
+
+def peak_memory(search, heuristic, state, puzzle):
+    """
+    Runs one search again under tracemalloc, which slows it down too much to
+    be timed, and returns the peak memory in bytes allocated while it ran.
+    """
+    tracemalloc.start()
+    run_search(search, heuristic, state, puzzle)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def benchmark(n, depths, instances, searches, heuristic_names, seed=0):
+    """
+    Runs every search (with every heuristic, for informed searches) on the
+    same random instances and returns a list of dictionaries of FIELDS.
+    """
+    rng = random.Random(seed)
+    puzzle = npuzzle.PackedPuzzle(n)
+    rows = []
+    for depth in depths:
+        for instance in range(instances):
+            state = random_instance(puzzle, depth, rng)
+            for search in searches:
+                names = [None] if search in UNINFORMED_SEARCHES else heuristic_names
+                for name in names:
+                    heuristic = None if name is None else CountingHeuristic(HEURISTICS[name](n))
+                    (solution, states_expanded, max_fringe), elapsed = run_search(search, heuristic, state, puzzle)
+                    peak = peak_memory(search, None if name is None else HEURISTICS[name](n), state, puzzle)
+                    rows.append({
+                        'n': n,
+                        'depth': depth,
+                        'instance': instance,
+                        'search': search,
+                        'heuristic': name,
+                        'solution_length': None if solution is None else len(solution),
+                        'states_expanded': states_expanded,
+                        'max_fringe': max_fringe,
+                        'heuristic_calls': 0 if heuristic is None else heuristic.calls,
+                        'heuristic_deltas': 0 if heuristic is None else heuristic.deltas,
+                        'time': round(elapsed, 6),
+                        'nodes_per_second': round(states_expanded / elapsed) if elapsed else None,
+                        'peak_memory': peak,
+                    })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the n-Puzzle searches.")
+    parser.add_argument('--n', type=int, default=3)
+    parser.add_argument('--depths', type=int, nargs='+', default=[10, 20, 30])
+    parser.add_argument('--instances', type=int, default=5)
+    parser.add_argument('--searches', nargs='+', choices=sorted(SEARCHES),
+                        default=['bfs', 'bidirectional_bfs', 'best_first', 'astar', 'ida_star', 'rbfs'])
+    parser.add_argument('--heuristics', nargs='+', choices=sorted(HEURISTICS), default=sorted(HEURISTICS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--format', choices=['csv', 'json'], default='csv')
+    parser.add_argument('--output', help="file to write the report to (default: stdout)")
+    args = parser.parse_args()
+
+    rows = benchmark(args.n, args.depths, args.instances, args.searches, args.heuristics, args.seed)
+
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        if args.format == 'json':
+            json.dump(rows, out, indent=2)
+            out.write("\n")
+        else:
+            writer = csv.DictWriter(out, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+COMS W4701 Artificial Intelligence - Programming Homework 1
+
+Additive disjoint pattern database heuristics for the n-Puzzle.
+
+The tiles of an n x n board (without the hole) are split into disjoint
+patterns. For each pattern, a backward breadth first search from the goal
+over the abstract states (positions of the pattern tiles and the hole)
+records how many moves of pattern tiles are needed to place them. Moves of
+other tiles are free, so the values of disjoint patterns can be added and
+still never overestimate the true solution length.
+
+The databases are built once, saved to a file and memory-mapped when loaded.
+Usage: python npuzzle_pdb.py n filename [group_size]
+
+@author: Naman Jain (nj2387)
+"""
+
+import mmap
+import struct
+import sys
+import time
+
+from collections import deque
+
+from npuzzle import PackedPuzzle
+
+MAGIC = b'NPDB'
+HEADER = struct.Struct('<4sBB')   # magic, n, number of patterns
+PATTERN_HEADER = struct.Struct('<B')   # number of tiles in the pattern
+UNKNOWN = 255
+
+
+def default_patterns(n, group_size=None):
+    """
+    Splits the tiles 1..n*n-1 into consecutive groups of group_size tiles.
+    """
+    if group_size is None:
+        group_size = {3: 4, 4: 5}.get(n, 3)
+    tiles = list(range(1, n * n))
+    return [tuple(tiles[k:k + group_size]) for k in range(0, len(tiles), group_size)]
+
+
+def neighbours(n):
+    """
+    Returns, for each row-major cell index, the indices of its neighbours.
+    """
+    result = []
+    for cell in range(n * n):
+        i, j = divmod(cell, n)
+        result.append(tuple(i2 * n + j2 for i2, j2 in ((i, j + 1), (i, j - 1), (i + 1, j), (i - 1, j))
+                            if 0 <= i2 < n and 0 <= j2 < n))
+    return result
+
+
+def build_pattern_database(n, pattern):
+    """
+    Returns the database of one pattern as a bytearray indexed by the
+    positions of the pattern tiles, written as a base n*n number (the
+    position of pattern[m] is digit m).
+    The search is a 0-1 breadth first search from the goal: moving a pattern
+    tile into the hole costs one, moving any other tile costs nothing.
+    """
+    size = n * n
+    k = len(pattern)
+    weights = [size ** m for m in range(k)]
+    adjacent = neighbours(n)
+
+    table = bytearray([UNKNOWN]) * (size ** k)
+    seen = bytearray(size ** k * size)
+
+    # Abstract state: (index of the pattern positions, position of the hole)
+    start = sum(tile * weight for tile, weight in zip(pattern, weights))
+    fringe = deque([(start, 0, 0)])
+    while fringe:
+        index, blank, cost = fringe.popleft()
+        key = index * size + blank
+        if seen[key]:
+            continue
+        seen[key] = 1
+        if cost < table[index]:
+            table[index] = cost
+
+        positions = [(index // weight) % size for weight in weights]
+        for cell in adjacent[blank]:
+            if cell in positions:
+                m = positions.index(cell)
+                child = index + (blank - cell) * weights[m]
+                if not seen[child * size + cell]:
+                    fringe.append((child, cell, cost + 1))
+            elif not seen[index * size + cell]:
+                fringe.appendleft((index, cell, cost))
+    return table
+
+
+def save_pattern_databases(filename, n, patterns, tables):
+    """
+    Writes the databases to filename: a header, then for each pattern its
+    tiles followed by its table, one byte per entry.
+    """
+    with open(filename, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, n, len(patterns)))
+        for pattern, table in zip(patterns, tables):
+            f.write(PATTERN_HEADER.pack(len(pattern)))
+            f.write(bytes(pattern))
+            f.write(table)
+
+
+def load_pattern_databases(filename):
+    """
+    Memory-maps a file written by save_pattern_databases and returns a
+    PatternDatabaseHeuristic reading its tables directly from the mapping.
+    """
+    with open(filename, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, n, count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("{} is not a pattern database file.".format(filename))
+
+    view = memoryview(data)
+    offset = HEADER.size
+    patterns = []
+    tables = []
+    for _ in range(count):
+        (k,) = PATTERN_HEADER.unpack_from(data, offset)
+        offset += PATTERN_HEADER.size
+        patterns.append(tuple(data[offset:offset + k]))
+        offset += k
+        length = (n * n) ** k
+        tables.append(view[offset:offset + length])
+        offset += length
+    return PatternDatabaseHeuristic(n, patterns, tables)
+
+
+class PatternDatabaseHeuristic(object):
+    """
+    Additive pattern database heuristic for an n x n board. It can be passed
+    to best_first, astar, ida_star and rbfs like any other heuristic, on tuple
+    or packed states.
+    """
+
+    def __init__(self, n, patterns, tables):
+        self.n = n
+        self.puzzle = PackedPuzzle(n)
+        self.patterns = patterns
+        self.tables = tables
+        size = n * n
+        self.weights = [[size ** m for m in range(len(pattern))] for pattern in patterns]
+
+    @classmethod
+    def build(cls, n, patterns=None):
+        if patterns is None:
+            patterns = default_patterns(n)
+        return cls(n, patterns, [build_pattern_database(n, pattern) for pattern in patterns])
+
+    def save(self, filename):
+        save_pattern_databases(filename, self.n, self.patterns, self.tables)
+
+    def __call__(self, state):
+        cells = self.puzzle.cells(state) if isinstance(state, int) else [s for st in state for s in st]
+        positions = [0] * len(cells)
+        for index, tile in enumerate(cells):
+            positions[tile] = index
+
+        estimate = 0
+        for pattern, weights, table in zip(self.patterns, self.weights, self.tables):
+            estimate += table[sum(positions[tile] * weight for tile, weight in zip(pattern, weights))]
+        return estimate
+
+
+if __name__ == "__main__":
+
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python npuzzle_pdb.py n filename [group_size]")
+    else:
+        n = int(sys.argv[1])
+        group_size = int(sys.argv[3]) if len(sys.argv) == 4 else None
+        patterns = default_patterns(n, group_size)
+        tables = []
+        for pattern in patterns:
+            start = time.time()
+            tables.append(build_pattern_database(n, pattern))
+            print("Pattern {}: {:.3f}s".format(pattern, time.time() - start))
+        save_pattern_databases(sys.argv[2], n, patterns, tables)
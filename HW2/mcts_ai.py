@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+"""
+COMS W4701 Artificial Intelligence - Programming Homework 2
+
+A Monte Carlo Tree Search (UCT) player for Othello. Each playout walks down
+the tree choosing children by their upper confidence bound, adds one new
+node, finishes the game with random moves and backs the result up the path.
+The move played is the most visited child of the root. Move generation uses
+the bitboards of othello_bitboard.
+
+The tree is kept between moves: the subtree of the opponent's actual reply
+becomes the root of the next search. With more than one worker, the other
+processes grow independent trees from the same position for the same time
+(root parallelization) and their root visit counts are added to ours.
+
+As in the game manager, the game ends when the player to move has no legal
+move.
+
+@author: Naman Jain (nj2387)
+"""
+
+import math
+import os
+import random
+import sys
+import time
+
+from multiprocessing import Pool
+
+from othello_bitboard import flip_mask, from_board, geometry, get_moves, move_mask, play, popcount, squares
+
+# Seconds a move may take. The game manager gives up on an AI after
+# AiPlayerInterface.TIMEOUT (10) seconds.
+TIME_BUDGET = float(os.environ.get("OTHELLO_TIME_BUDGET", 8.0))
+
+# Number of processes running playouts; 0 or 1 uses this process only.
+PARALLEL_WORKERS = int(os.environ.get("OTHELLO_WORKERS", 0))
+
+# Fraction of the time left before a deadline given to select_move that the
+# search may use.
+DEADLINE_FRACTION = 0.9
+
+EXPLORATION = math.sqrt(2)  # UCT exploration constant.
+
+tree_root = None  # Node of the position after our last move, for reuse.
+worker_pool = None  # Process pool of the root parallel search, started on first use.
+playout_stats = {"playouts": 0, "seconds": 0.0}  # Of the last move, over all processes.
+
+
+class Node(object):
+    """
+    A node of the search tree: a position, the color to move in it, and the
+    statistics of the playouts through it. wins counts the wins (a draw is
+    half a win) of the player who made the move leading to the node, so that
+    a parent picks its children by their own wins.
+    """
+
+    __slots__ = ("position", "color", "move", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, position, color, geo, rng, parent=None, move=None):
+        self.position = position
+        self.color = color
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = get_moves(position, color, geo)
+        rng.shuffle(self.untried)
+        self.visits = 0
+        self.wins = 0.0
+
+    def best_child(self):
+        log_visits = math.log(self.visits)
+        return max(self.children,
+                   key=lambda child: child.wins / child.visits + EXPLORATION * math.sqrt(log_visits / child.visits))
+
+
+def random_playout(position, color, geo, rng):
+    """
+    Plays random moves from position, color to move, until the player to
+    move cannot move. Returns the winner (1 or 2), or 0 for a draw.
+    """
+    dark, light = position
+    own, opp = (dark, light) if color == 1 else (light, dark)
+    while True:
+        moves = move_mask(own, opp, geo)
+        if not moves:
+            break
+        move = rng.choice(squares(moves))
+        flips = flip_mask(own, opp, move, geo)
+        own, opp = opp & ~flips, own | flips | (1 << move)
+        color = 3 - color
+    difference = popcount(own) - popcount(opp)
+    if difference == 0:
+        return 0
+    return color if difference > 0 else 3 - color
+
+
+def run_playout(root, geo, rng):
+    """
+    Runs one playout from root: selection, expansion, simulation and
+    backpropagation.
+    """
+    node = root
+    while not node.untried and node.children:
+        node = node.best_child()
+    if node.untried:
+        move = node.untried.pop()
+        child = Node(play(node.position, node.color, move, geo), 3 - node.color, geo, rng, node, move)
+        node.children.append(child)
+        node = child
+
+    winner = random_playout(node.position, node.color, geo, rng)
+    while node is not None:
+        node.visits += 1
+        if winner == 0:
+            node.wins += 0.5
+        elif winner != node.color:
+            node.wins += 1
+        node = node.parent
+
+
+def grow_tree(root, geo, rng, deadline):
+    """
+    Runs playouts from root until deadline (at least one) and returns their
+    number.
+    """
+    playouts = 0
+    while True:
+        run_playout(root, geo, rng)
+        playouts += 1
+        if time.time() >= deadline:
+            return playouts
+
+
+def search_worker(job):
+    """
+    Grows a tree of its own in a worker process and returns the playout count
+    and the (move, visits) of the root's children. job is a (position, color,
+    n, deadline, seed) tuple.
+    """
+    position, color, n, deadline, seed = job
+    geo = geometry(n)
+    rng = random.Random(seed)
+    root = Node(position, color, geo, rng)
+    playouts = grow_tree(root, geo, rng, deadline)
+    return playouts, [(child.move, child.visits) for child in root.children]
+
+
+def reuse_tree(position, color, geo, rng):
+    """
+    Returns the node of the kept tree for position, color to move (the root
+    after our last move, or one of its children), as a new root, or a new
+    node if the tree does not contain it.
+    """
+    if tree_root is not None:
+        for node in [tree_root] + tree_root.children:
+            if node.position == position and node.color == color:
+                node.parent = None
+                return node
+    return Node(position, color, geo, rng)
+
+
+def select_move_mcts(board, color, time_budget=TIME_BUDGET, workers=PARALLEL_WORKERS):
+    """
+    Returns the move (column, row) with the most playouts after time_budget
+    seconds of search, using workers processes.
+    """
+    global tree_root, worker_pool
+    geo = geometry(len(board))
+    position = from_board(board)
+    if not get_moves(position, color, geo):
+        return None, None
+
+    start = time.time()
+    deadline = start + time_budget
+    rng = random.Random()
+    root = reuse_tree(position, color, geo, rng)
+
+    pending = None
+    if workers > 1:
+        if worker_pool is None:
+            worker_pool = Pool(workers - 1)
+        jobs = [(position, color, geo.n, deadline, rng.getrandbits(64)) for _ in range(workers - 1)]
+        pending = worker_pool.map_async(search_worker, jobs)
+
+    playouts = grow_tree(root, geo, rng, deadline)
+    visits = {child.move: child.visits for child in root.children}
+    if pending is not None:
+        for worker_playouts, worker_visits in pending.get():
+            playouts += worker_playouts
+            for move, count in worker_visits:
+                visits[move] = visits.get(move, 0) + count
+
+    playout_stats["playouts"] = playouts
+    playout_stats["seconds"] = time.time() - start
+
+    best_move = max(visits, key=visits.get)
+    tree_root = None
+    for child in root.children:
+        if child.move == best_move:
+            tree_root = child
+    return best_move % geo.n, best_move // geo.n
+
+
+def playouts_per_second():
+    """
+    Returns the playout rate of the last move, over all processes.
+    """
+    if not playout_stats["seconds"]:
+        return 0.0
+    return playout_stats["playouts"] / playout_stats["seconds"]
+
+
+def select_move(board, color, deadline=None):
+    """
+    The move of select_move_mcts, for players that call this AI directly
+    (see InProcessPlayer in othello_game). If deadline is given, the search
+    stops early enough to return before time.time() reaches it.
+    """
+    time_budget = TIME_BUDGET
+    if deadline is not None:
+        time_budget = max(0.0, min(time_budget, DEADLINE_FRACTION * (deadline - time.time())))
+    return select_move_mcts(board, color, time_budget)
+
+
+####################################################
+def run_ai():
+    """
+    This function establishes communication with the game manager.
+    It first introduces itself and receives its color.
+    Then it repeatedly receives the current score and current board state
+    until the game is over. The playout rate of every move is written to
+    stderr if the environment variable OTHELLO_STATS is set.
+    """
+    print("MCTS") # First line is the name of this AI
+    color = int(input()) # Then we read the color: 1 for dark (goes first),
+                         # 2 for light.
+    verbose = bool(os.environ.get("OTHELLO_STATS"))
+
+    while True: # This is the main loop
+        # Read in the current game status, for example:
+        # "SCORE 2 2" or "FINAL 33 31" if the game is over.
+        # The first number is the score for player 1 (dark), the second for player 2 (light)
+        next_input = input()
+        status, dark_score_s, light_score_s = next_input.strip().split()
+
+        if status == "FINAL": # Game is over.
+            print
+        else:
+            board = eval(input()) # Read in the input and turn it into a Python
+                                  # object. The format is a list of rows.
+
+            # Select the move and send it to the manager
+            movei, movej = select_move_mcts(board, color)
+            if verbose:
+                sys.stderr.write("MCTS: {} playouts, {:.0f} playouts/s\n".format(
+                    playout_stats["playouts"], playouts_per_second()))
+            print("{} {}".format(movei, movej), flush=True)
+
+
+if __name__ == "__main__":
+    run_ai()
@@ -10,18 +10,61 @@ complete and submit.
 @author: NAMAN JAIN AND nj2387
 """
 
+import json
+import math
+import os
 import random
+import struct
 import sys
+import threading
 import time
 
 from heapq import heappush
 from heapq import heappop
+from multiprocessing import Pool
 
 # You can use the functions in othello_shared to write your AI 
 from othello_shared import find_lines, get_possible_moves, get_score, play_move
+from othello_bitboard import (canonical, flip_mask, from_board, from_cells, geometry, get_moves, move_mask, play, 
+                              popcount, squares)
+from othello_eval import evaluate
+from othello_book import lookup, lookup_position
 
 states_minimax_values = {}  # For storing the minimax value of a board state.
 
+# Seconds the iterative deepening search may spend on a move. The game 
+# manager gives up on an AI after AiPlayerInterface.TIMEOUT (10) seconds.
+TIME_BUDGET = float(os.environ.get("OTHELLO_TIME_BUDGET", 8.0))
+
+# Number of processes searching root moves in parallel; 0 or 1 searches in
+# this process only.
+PARALLEL_WORKERS = int(os.environ.get("OTHELLO_WORKERS", 0))
+
+# With this many empty squares or fewer, the endgame solver looks for the 
+# move with the best final disc difference, using at most ENDGAME_FRACTION
+# of the time budget before falling back to iterative deepening.
+ENDGAME_EMPTIES = int(os.environ.get("OTHELLO_ENDGAME_EMPTIES", 12))
+ENDGAME_FRACTION = 0.5
+
+# Fraction of the time left before a deadline given to select_move that the
+# search may use, leaving the rest for the search to notice it is out of time.
+DEADLINE_FRACTION = 0.9
+
+# Whether run_ai searches on the opponent's time (see ponder).
+PONDER = os.environ.get("OTHELLO_PONDER", "1") != "0"
+
+search_deadline = None  # time.time() after which the running search stops.
+worker_pool = None  # Process pool of the parallel search, started on first use.
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def check_time():
+    if search_deadline is not None and time.time() > search_deadline:
+        raise SearchTimeout
+
 
 def compute_utility(board, color):
     """
@@ -37,152 +80,827 @@ def compute_utility(board, color):
     return 0
 
 
-############ MINIMAX ###############################
+def position_utility(position, color):
+    """
+    Same as compute_utility, for a (dark, light) bitboard position. 
+    """
+    dark, light = position
+    if color == 1:
+        return popcount(dark) - popcount(light)
+    return popcount(light) - popcount(dark)
 
-def minimax_min_node(board, color):
-    moves = get_possible_moves(board, color)
-    if not moves:
-        return compute_utility(board, color)
-    best_score = float('inf')
-    for move in moves:
-        next_move = play_move(board, color, move[0], move[1])
-        score = minimax_max_node(next_move, color)
-        if score < best_score:
-            best_score = score
-    return best_score
+
+# Final disc differences are multiplied by this, so that a won game scores
+# higher than any heuristic evaluation.
+TERMINAL_WEIGHT = 1000
+
+
+def evaluate_position(position, color, geo):
+    """
+    Heuristic value of a (dark, light) position for color, used when the 
+    search stops before the end of the game (see othello_eval). 
+    """
+    dark, light = position
+    if color == 1:
+        return evaluate(dark, light, geo)
+    return evaluate(light, dark, geo)
 
 
-def minimax_max_node(board, color):
-    moves = get_possible_moves(board, color)
+def to_move(square, geo):
+    """
+    Converts a bitboard square into the (column, row) tuple sent to the manager.
+    """
+    return square % geo.n, square // geo.n
+
+
+############ MINIMAX ###############################
+
+def minimax(position, color, geo):
+    """
+    Negamax value of position for color, the player to move: the final disc
+    difference with best play by both sides. As in play_game, the game is 
+    over as soon as the player to move has no legal move.
+    """
+    moves = get_moves(position, color, geo)
     if not moves:
-        return compute_utility(board, color)
+        return position_utility(position, color)
     best_score = float('-inf')
     for move in moves:
-        next_move = play_move(board, color, move[0], move[1])
-        score = minimax_min_node(next_move, color)
+        next_move = play(position, color, move, geo)
+        score = -minimax(next_move, 3 - color, geo)
         if score > best_score:
             best_score = score
     return best_score
 
-    
+
 def select_move_minimax(board, color):
     """
     Given a board and a player color, decide on a move. 
     The return value is a tuple of integers (i,j), where
     i is the column and j is the row on the board.
     """
-    moves = get_possible_moves(board, color)
+    geo = geometry(len(board))
+    position = from_board(board)
+    moves = get_moves(position, color, geo)
     if not moves:
         return None, None
     best_move = moves[0]
     best_score = float('-inf')
     for move in moves:
-        next_move = play_move(board, color, move[0], move[1])
-        if next_move in states_minimax_values:
-            score = states_minimax_values[next_move]
+        next_move = play(position, color, move, geo)
+        # Symmetric positions have the same value, so they share an entry.
+        key = canonical(next_move, geo)[0], color
+        if key in states_minimax_values:
+            score = states_minimax_values[key]
         else:
-            score = minimax_min_node(next_move, color)
-            states_minimax_values[next_move] = score
+            score = -minimax(next_move, 3 - color, geo)
+            states_minimax_values[key] = score
         if score > best_score:
             best_move = move
             best_score = score
-    return best_move
+    return to_move(best_move, geo)
+
+
+############ TRANSPOSITION TABLE ###################
+#
+# Positions are identified by Zobrist keys: the XOR of a random 64-bit number
+# for every (color, square) pair occupied in the position, plus one when light
+# is to move (scores are always from the perspective of the player to move).
+# A move only changes a few squares, so the key of a child is computed from 
+# its parent's key. 
+# The 8 rotations and reflections of a position share their entry: a key packs
+# 8 64-bit lanes, lane k being the Zobrist key of the k-th symmetric image of
+# the position (see Geometry.symmetries), all updated by the same XORs. The 
+# table is indexed by the smallest lane, and best moves are stored in the 
+# frame of the image with that lane.
+# The table is a fixed size list indexed by the low bits of the key. An entry
+# is (key, depth, bound, score, best move, generation); a slot is replaced by
+# an entry searched at least as deep, or by any entry of a newer search.
+
+TABLE_SIZE = 1 << 18
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+zobrist_random = random.Random(4701)
+ZOBRIST_SQUARES = 256
+ZOBRIST = [None, 
+           [zobrist_random.getrandbits(64) for _ in range(ZOBRIST_SQUARES)],
+           [zobrist_random.getrandbits(64) for _ in range(ZOBRIST_SQUARES)]]
+ZOBRIST_LIGHT = zobrist_random.getrandbits(64)
+
+ZOBRIST_LANES = struct.Struct('<8Q')
+ALL_LANES = sum(1 << (64 * lane) for lane in range(8))  # Multiplying by it copies a number to every lane.
+LIGHT_LANES = ZOBRIST_LIGHT * ALL_LANES
+
+zobrist_tables = {}  # For storing the packed Zobrist numbers of each board size.
+
+transposition_table = [None] * TABLE_SIZE
+search_generation = 0
+
+
+def zobrist_lanes(geo):
+    """
+    Returns the packed Zobrist numbers of the squares of an n x n board, as
+    ([None, dark, light], flip) lists by square. Lane k of the number of a 
+    square is the 64-bit number of the square symmetry k moves it to.
+    """
+    if geo.n not in zobrist_tables:
+        packed = [None]
+        for color in (1, 2):
+            packed.append([sum(ZOBRIST[color][permutation[square]] << (64 * lane)
+                               for lane, permutation in enumerate(geo.symmetries))
+                           for square in range(geo.size)])
+        flips = [dark ^ light for dark, light in zip(packed[1], packed[2])]
+        zobrist_tables[geo.n] = (packed, flips)
+    return zobrist_tables[geo.n]
+
+
+def zobrist_hash(position, color, geo):
+    """
+    Returns the packed Zobrist key of position with color to move.
+    """
+    packed, _ = zobrist_lanes(geo)
+    dark, light = position
+    key = LIGHT_LANES if color == 2 else 0
+    for square in squares(dark):
+        key ^= packed[1][square]
+    for square in squares(light):
+        key ^= packed[2][square]
+    return key
 
 
-############ ALPHA-BETA PRUNING #####################
+def child_key(key, position, child, color, move, geo):
+    """
+    Returns the Zobrist key of child, reached from position (with the given
+    key) when color plays move. 
+    """
+    packed, flips = zobrist_lanes(geo)
+    key ^= packed[color][move] ^ LIGHT_LANES
+    for square in squares(position[color - 1] ^ child[color - 1] ^ (1 << move)):
+        key ^= flips[square]
+    return key
 
-def alphabeta_min_node(board, color, alpha, beta, level, limit):
-    moves = get_possible_moves(board, color)
-    if not moves or level > limit:
-        return compute_utility(board, color)
-    best_score = float('inf')
-    for move in moves:
-        next_move = play_move(board, color, move[0], move[1])
-        best_score = min(best_score, alphabeta_max_node(next_move, color, alpha, beta, level + 1, limit))
-        if best_score <= alpha:
-            return best_score
-        beta = min(beta, best_score)
-    return best_score
+
+def canonical_key(key):
+    """
+    Returns the smallest lane of a packed key, which is the same for all the
+    symmetric images of a position, and the symmetry of that lane.
+    """
+    lanes = ZOBRIST_LANES.unpack(key.to_bytes(64, 'little'))
+    smallest = min(lanes)
+    return smallest, lanes.index(smallest)
 
 
-# def alphabeta_min_node(board, color, alpha, beta):
-#     moves = get_possible_moves(board, color)
-#     if not moves:
-#         return compute_utility(board, color)
-#     best_score = float('inf')
-#     for move in moves:
-#         next_move = play_move(board, color, move[0], move[1])
-#         best_score = min(best_score, alphabeta_max_node(next_move, color, alpha, beta))
-#         if best_score <= alpha:
-#             return best_score
-#         beta = min(beta, best_score)
-#     return best_score
-
-
-def alphabeta_max_node(board, color, alpha, beta, level, limit):
-    moves = get_possible_moves(board, color)
-    if not moves or level > limit:
-        return compute_utility(board, color)
+def probe_table(key, geo):
+    """
+    Returns the entry of the node with the packed key, with its best move in
+    the frame of the node, or None.
+    """
+    key, symmetry = canonical_key(key)
+    entry = transposition_table[key & (TABLE_SIZE - 1)]
+    if stats is not None:
+        stats["tt_probes"] += 1
+        stats["tt_hits"] += entry is not None and entry[0] == key
+    if entry is None or entry[0] != key:
+        return None
+    if symmetry and entry[4] is not None:
+        entry = entry[:4] + (geo.inverse_symmetries[symmetry][entry[4]], entry[5])
+    return entry
+
+
+def table_cutoff(entry, depth, alpha, beta):
+    """
+    Returns the score stored in entry if it was searched deep enough and
+    settles the value of the node for the window (alpha, beta), else None.
+    """
+    _, entry_depth, bound, score, _, _ = entry
+    if entry_depth < depth:
+        return None
+    if bound == EXACT or (bound == LOWER_BOUND and score >= beta) or (bound == UPPER_BOUND and score <= alpha):
+        return score
+    return None
+
+
+def store_table(key, depth, bound, score, move, geo):
+    key, symmetry = canonical_key(key)
+    index = key & (TABLE_SIZE - 1)
+    entry = transposition_table[index]
+    if entry is None or entry[0] == key or entry[1] <= depth or entry[5] != search_generation:
+        move = geo.symmetries[symmetry][move]
+        transposition_table[index] = (key, depth, bound, score, move, search_generation)
+
+
+############ MOVE ORDERING #########################
+#
+# Moves are searched in this order: the best move stored in the transposition
+# table (the principal variation move after an earlier iteration), the killer
+# moves that last caused a cutoff at the same level, then by history score,
+# which grows by depth * depth every time a move causes a cutoff. 
+
+killer_moves = {}  # For storing the two most recent cutoff moves of each level.
+history_table = [None, [0] * ZOBRIST_SQUARES, [0] * ZOBRIST_SQUARES]
+ordering_counters = {"nodes": 0, "cutoffs": 0, "first_move_cutoffs": 0}
+
+
+def order_moves(moves, color, level, entry):
+    hash_move = entry[4] if entry is not None else None
+    killers = killer_moves.get(level, ())
+    history = history_table[color]
+    return sorted(moves, key=lambda move: (move == hash_move, move in killers, history[move]), reverse=True)
+
+
+def record_cutoff(move, color, level, depth, index):
+    """
+    Updates the killer moves, history table and counters after move, the
+    index-th move searched at its node, caused a cutoff.
+    """
+    killers = killer_moves.get(level, [])
+    if move not in killers:
+        killer_moves[level] = [move] + killers[:1]
+    history_table[color][move] += depth * depth
+    ordering_counters["cutoffs"] += 1
+    if stats is not None:
+        count_cutoff(level)
+    if index == 0:
+        ordering_counters["first_move_cutoffs"] += 1
+
+
+def new_search():
+    """
+    Forgets the killer moves of the previous move and ages the history table.
+    """
+    killer_moves.clear()
+    for history in history_table[1:]:
+        for square in range(len(history)):
+            history[square] //= 2
+    for counter in ordering_counters:
+        ordering_counters[counter] = 0
+
+
+def ordering_stats():
+    """
+    Returns the cutoff rate (cutoffs per interior node searched) and the
+    fraction of cutoffs caused by the first move searched.
+    """
+    nodes = ordering_counters["nodes"]
+    cutoffs = ordering_counters["cutoffs"]
+    return {
+        "nodes": nodes,
+        "cutoffs": cutoffs,
+        "cutoff_rate": cutoffs / nodes if nodes else 0.0,
+        "first_move_cutoff_rate": ordering_counters["first_move_cutoffs"] / cutoffs if cutoffs else 0.0,
+    }
+
+
+############ SEARCH STATISTICS #####################
+#
+# With OTHELLO_STATS set ("stderr", or the name of a file to append to), every
+# select_move_iterative search collects statistics in the dictionary stats, 
+# and write_stats logs them as one line of JSON per move (never on stdout, 
+# which is the protocol). When stats is None the search only pays one test 
+# per node. Nodes searched by parallel worker processes are not counted.
+
+STATS_LOG = os.environ.get("OTHELLO_STATS")
+
+stats = None  # Statistics of the current search, or None when they are off.
+
+
+def start_stats():
+    global stats
+    stats = {"empties": None, "nodes": 0, "endgame_nodes": 0, "tt_probes": 0, "tt_hits": 0, "tt_cutoffs": 0,
+             "cutoffs_per_ply": [], "iterations": [], "start": time.time()}
+
+
+def count_cutoff(level):
+    cutoffs = stats["cutoffs_per_ply"]
+    while len(cutoffs) <= level + 1:
+        cutoffs.append(0)
+    cutoffs[level + 1] += 1
+
+
+def record_iteration(limit):
+    """
+    Records the nodes and time used so far after the iteration with the given
+    depth limit completed.
+    """
+    stats["iterations"].append({"limit": limit, "nodes": stats["nodes"], "seconds": time.time() - stats["start"]})
+
+
+def search_report(color, move):
+    """
+    Returns the statistics of the last search as a JSON-compatible dictionary:
+    totals, nodes per second, the effective branching factor (ratio of the
+    nodes of the last two completed iterations), the transposition table hit
+    rate, cutoffs by ply (the root's children are ply 1) and the nodes and 
+    time of every iteration.
+    """
+    seconds = time.time() - stats["start"]
+    nodes = stats["nodes"] + stats["endgame_nodes"]
+    iterations = []
+    previous_nodes = previous_seconds = 0
+    for iteration in stats["iterations"]:
+        iterations.append({"limit": iteration["limit"], "nodes": iteration["nodes"] - previous_nodes,
+                           "seconds": round(iteration["seconds"] - previous_seconds, 6)})
+        previous_nodes, previous_seconds = iteration["nodes"], iteration["seconds"]
+    ebf = None
+    if len(iterations) >= 2 and iterations[-2]["nodes"]:
+        ebf = iterations[-1]["nodes"] / iterations[-2]["nodes"]
+    report = ordering_stats()
+    report.update({
+        "color": color,
+        "empties": stats["empties"],
+        "move": list(move),
+        "seconds": round(seconds, 6),
+        "nodes": nodes,
+        "endgame_nodes": stats["endgame_nodes"],
+        "nodes_per_second": round(nodes / seconds) if seconds else None,
+        "depth": iterations[-1]["limit"] if iterations else None,
+        "effective_branching_factor": ebf,
+        "tt_probes": stats["tt_probes"],
+        "tt_hit_rate": stats["tt_hits"] / stats["tt_probes"] if stats["tt_probes"] else 0.0,
+        "tt_cutoffs": stats["tt_cutoffs"],
+        "cutoffs_per_ply": stats["cutoffs_per_ply"],
+        "iterations": iterations,
+    })
+    return report
+
+
+def write_stats(color, move):
+    """
+    Logs the statistics of the last search, if they are on.
+    """
+    if stats is None or not STATS_LOG:
+        return
+    line = json.dumps(search_report(color, move)) + "\n"
+    if STATS_LOG == "stderr":
+        sys.stderr.write(line)
+        sys.stderr.flush()
+    else:
+        with open(STATS_LOG, 'a') as f:
+            f.write(line)
+
+
+############ ALPHA-BETA PRUNING #####################
+
+def alphabeta(position, color, alpha, beta, level, limit, geo, key):
+    """
+    Negamax alpha-beta search: returns the value of position for color, the
+    player to move, if it is inside the window (alpha, beta), or a bound on it
+    otherwise. Nodes deeper than limit are evaluated heuristically. As in 
+    play_game, the game is over as soon as the player to move has no legal
+    move, and the final disc difference is scored.
+    """
+    check_time()
+    if stats is not None:
+        stats["nodes"] += 1
+    moves = get_moves(position, color, geo)
+    if not moves:
+        return TERMINAL_WEIGHT * position_utility(position, color)
+    if level > limit:
+        return evaluate_position(position, color, geo)
+    depth = limit - level + 1
+    entry = probe_table(key, geo)
+    if entry is not None:
+        score = table_cutoff(entry, depth, alpha, beta)
+        if score is not None:
+            if stats is not None:
+                stats["tt_cutoffs"] += 1
+            return score
+    ordering_counters["nodes"] += 1
+    moves = order_moves(moves, color, level, entry)
+    original_alpha = alpha
     best_score = float('-inf')
-    for move in moves:
-        next_move = play_move(board, color, move[0], move[1])
-        best_score = max(best_score, alphabeta_min_node(next_move, color, alpha, beta, level + 1, limit))
+    best_move = moves[0]
+    for index, move in enumerate(moves):
+        next_move = play(position, color, move, geo)
+        next_key = child_key(key, position, next_move, color, move, geo)
+        score = -alphabeta(next_move, 3 - color, -beta, -alpha, level + 1, limit, geo, next_key)
+        if score > best_score:
+            best_score = score
+            best_move = move
         if best_score >= beta:
+            record_cutoff(move, color, level, depth, index)
+            store_table(key, depth, LOWER_BOUND, best_score, best_move, geo)
             return best_score
         alpha = max(alpha, best_score)
+    store_table(key, depth, UPPER_BOUND if best_score <= original_alpha else EXACT, best_score, best_move, geo)
     return best_score
 
 
-# def alphabeta_max_node(board, color, alpha, beta):
-#     moves = get_possible_moves(board, color)
-#     if not moves:
-#         return compute_utility(board, color)
-#     best_score = float('-inf')
-#     for move in moves:
-#         next_move = play_move(board, color, move[0], move[1])
-#         best_score = max(best_score, alphabeta_min_node(next_move, color, alpha, beta))
-#         if best_score >= beta:
-#             return best_score
-#         alpha = max(alpha, best_score)
-#     return best_score
+def select_move_alphabeta(board, color, limit, use_book=True):
+    if use_book:
+        book_move = lookup(board, color)
+        if book_move is not None:
+            return book_move
+    return search_root(from_board(board), color, limit, geometry(len(board)))
 
 
-def select_move_alphabeta(board, color, limit):
-    moves = get_possible_moves(board, color)
+def search_root(position, color, limit, geo):
+    """
+    Same as select_move_alphabeta (without the book), for a (dark, light) 
+    position.
+    """
+    global search_generation
+    search_generation += 1
+    moves = get_moves(position, color, geo)
     if not moves:
         return None, None
-    moves = sorted_moves(board, color, moves)
-    best_move = moves[0]
+    key = zobrist_hash(position, color, geo)
+    moves = sorted_moves(position, color, moves, geo)
+    entry = probe_table(key, geo)
+    if entry is not None:
+        # Search the best move of the previous iteration first.
+        moves.sort(key=lambda m: m[1] != entry[4])
+    best_move = moves[0][1]
     best_score = float('-inf')
     alpha = float('-inf')
     beta = float('inf')
     for move in moves:
         level = 0
         next_move = move[2]
-        if next_move in states_minimax_values:
-            score = states_minimax_values[next_move]
-        else:
-            score = alphabeta_min_node(next_move, color, alpha, beta, level, limit)
-            states_minimax_values[next_move] = score
+        next_key = child_key(key, position, next_move, color, move[1], geo)
+        score = -alphabeta(next_move, 3 - color, -beta, -alpha, level, limit, geo, next_key)
         if score > best_score:
             best_move = move[1]
             best_score = score
+        alpha = max(alpha, best_score)
+    store_table(key, limit + 1, EXACT, best_score, best_move, geo)
+    return to_move(best_move, geo)
+
+
+def select_move_iterative(board, color, time_budget=TIME_BUDGET, workers=PARALLEL_WORKERS, use_book=True,
+                          reset_ordering=True):
+    """
+    Iterative deepening alpha-beta search: runs select_move_alphabeta with
+    limit 0, 1, 2, ... until time_budget seconds are spent, and returns the
+    move of the deepest search that completed. Each iteration searches the 
+    best moves found by the previous one first (through the transposition 
+    table). Deepening stops early once the search reaches the end of the game.
+    Moves in the opening book are played without searching, and positions
+    with at most ENDGAME_EMPTIES empty squares are first given to the
+    endgame solver, which plays the move with the best final disc difference
+    under play_game's rules (the game ends when the player to move cannot
+    move) if it finishes in time. With more than one worker, each iteration is a select_move_parallel search.
+    reset_ordering=False keeps the killer moves and history table as they are
+    (see new_search), for searches that do not start a new move.
+    """
+    return search_position(from_board(board), color, len(board), time_budget, workers, use_book, reset_ordering)
+
+
+def search_position(position, color, n, time_budget=TIME_BUDGET, workers=PARALLEL_WORKERS, use_book=True,
+                    reset_ordering=True):
+    """
+    Same as select_move_iterative, for a (dark, light) position on an n x n 
+    board, so that callers that keep their own position (run_ai, ponder) do 
+    not convert it to a board and back.
+    """
+    global search_deadline
+    geo = geometry(n)
+    empties = geo.size - popcount(position[0] | position[1])
+    if STATS_LOG:
+        start_stats()
+        stats["empties"] = empties
+    if use_book:
+        book_move = lookup_position(position, color, n)
+        if book_move is not None:
+            return book_move
+
+    best_move = None, None
+    if reset_ordering:
+        new_search()
+    start = time.time()
+    try:
+        if empties <= ENDGAME_EMPTIES:
+            search_deadline = start + time_budget * ENDGAME_FRACTION
+            try:
+                return solve_root(position, color, geo)[0]
+            except SearchTimeout:
+                pass
+
+        search_deadline = start + time_budget
+        limit = 0
+        while True:
+            if workers > 1:
+                best_move = parallel_root(position, color, limit, workers, geo, best_move)
+            else:
+                best_move = search_root(position, color, limit, geo)
+            if stats is not None:
+                record_iteration(limit)
+            if best_move == (None, None) or limit + 2 >= empties:
+                break
+            limit += 1
+    except SearchTimeout:
+        pass
+    finally:
+        search_deadline = None
+
+    if best_move == (None, None):
+        moves = get_moves(position, color, geo)
+        if moves:
+            best_move = to_move(moves[0], geo)
     return best_move
 
 
-def sorted_moves(board, color, moves):
+def select_move(board, color, deadline=None):
+    """
+    The move of select_move_iterative, for players that call this AI 
+    directly (see InProcessPlayer in othello_game). If deadline is given, the
+    search stops early enough to return before time.time() reaches it.
+    """
+    time_budget = TIME_BUDGET
+    if deadline is not None:
+        time_budget = max(0.0, min(time_budget, DEADLINE_FRACTION * (deadline - time.time())))
+    move = select_move_iterative(board, color, time_budget)
+    write_stats(color, move)
+    return move
+
+
+############ ENDGAME SOLVER #######################
+#
+# Negamax search to the end of the game on (own, opp) bitboards, where own is
+# the player to move. As in play_game, the game ends as soon as the player to
+# move has no legal move, and the score is the final disc difference; under
+# that rule the solver's result is exact.
+# Moves in quadrants with an odd number of empty squares are searched first
+# (parity), then moves that leave the opponent the fewest replies. The last
+# empty square is scored directly, without generating moves.
+
+endgame_table = {}  # For storing (bound, score, best move) of solved positions.
+ENDGAME_TABLE_EMPTIES = 6  # Positions with fewer empties are not stored.
+ENDGAME_TABLE_LIMIT = 1 << 20  # The table is emptied when it grows past this.
+
+quadrant_tables = {}  # For storing the quadrant masks of each board size.
+
+
+def quadrants(geo):
+    if geo.n not in quadrant_tables:
+        half = (geo.n + 1) // 2
+        masks = [0, 0, 0, 0]
+        for square in range(geo.size):
+            i, j = square % geo.n, square // geo.n
+            masks[(i >= half) + 2 * (j >= half)] |= 1 << square
+        quadrant_tables[geo.n] = masks
+    return quadrant_tables[geo.n]
+
+
+def endgame_moves(own, opp, moves, empty, geo):
+    """
+    Returns the squares of moves in the order the solver searches them.
+    """
+    odd = 0
+    for mask in quadrants(geo):
+        if popcount(empty & mask) % 2:
+            odd |= mask
+    if popcount(empty) <= ENDGAME_TABLE_EMPTIES:
+        return sorted(squares(moves), key=lambda move: not (odd >> move) & 1)
+
+    def priority(move):
+        flips = flip_mask(own, opp, move, geo)
+        replies = move_mask(opp & ~flips, own | flips | (1 << move), geo)
+        return not (odd >> move) & 1, popcount(replies)
+    return sorted(squares(moves), key=priority)
+
+
+def solve_endgame(own, opp, alpha, beta, geo):
+    """
+    Returns the final disc difference (own minus opp) with best play if it is
+    inside the window (alpha, beta), or a bound on it otherwise.
+    """
+    check_time()
+    if stats is not None:
+        stats["endgame_nodes"] += 1
+    empty = geo.full & ~(own | opp)
+    if empty and not empty & (empty - 1):
+        square = empty.bit_length() - 1
+        flips = flip_mask(own, opp, square, geo)
+        if flips:
+            return popcount(own) - popcount(opp) + 2 * popcount(flips) + 1
+        return popcount(own) - popcount(opp)
+
+    moves = move_mask(own, opp, geo)
+    if not moves:
+        return popcount(own) - popcount(opp)
+
+    key = (own, opp)
+    entry = endgame_table.get(key)
+    if entry is not None:
+        bound, score, _ = entry
+        if bound == EXACT or (bound == LOWER_BOUND and score >= beta) or (bound == UPPER_BOUND and score <= alpha):
+            return score
+
+    original_alpha = alpha
+    best_score = float('-inf')
+    best_move = None
+    for move in endgame_moves(own, opp, moves, empty, geo):
+        flips = flip_mask(own, opp, move, geo)
+        score = -solve_endgame(opp & ~flips, own | flips | (1 << move), -beta, -alpha, geo)
+        if score > best_score:
+            best_score = score
+            best_move = move
+        if best_score >= beta:
+            break
+        alpha = max(alpha, best_score)
+
+    if popcount(empty) >= ENDGAME_TABLE_EMPTIES:
+        if best_score >= beta:
+            bound = LOWER_BOUND
+        elif best_score <= original_alpha:
+            bound = UPPER_BOUND
+        else:
+            bound = EXACT
+        endgame_table[key] = (bound, best_score, best_move)
+    return best_score
+
+
+def select_move_endgame(board, color):
+    """
+    Returns the move with the best final disc difference for color and that
+    difference, the game ending when the player to move has no legal move 
+    (as in play_game), or raises SearchTimeout if the deadline passes first.
+    """
+    return solve_root(from_board(board), color, geometry(len(board)))
+
+
+def solve_root(position, color, geo):
+    """
+    Same as select_move_endgame, for a (dark, light) position.
+    """
+    dark, light = position
+    own, opp = (dark, light) if color == 1 else (light, dark)
+    moves = move_mask(own, opp, geo)
+    if not moves:
+        return (None, None), None
+
+    # Entries stay valid from one move to the next (and from pondering to 
+    # the real search), so the table is only emptied when it gets too big.
+    if len(endgame_table) > ENDGAME_TABLE_LIMIT:
+        endgame_table.clear()
+    best_score = float('-inf')
+    best_move = None
+    for move in endgame_moves(own, opp, moves, geo.full & ~(own | opp), geo):
+        flips = flip_mask(own, opp, move, geo)
+        score = -solve_endgame(opp & ~flips, own | flips | (1 << move), float('-inf'), -best_score, geo)
+        if score > best_score:
+            best_score = score
+            best_move = move
+    return to_move(best_move, geo), best_score
+
+
+############ PARALLEL ROOT SPLITTING ###############
+
+def select_move_parallel(board, color, limit, workers, previous_move=None):
+    """
+    Alpha-beta search that splits the root moves across a pool of worker
+    processes (Young Brothers Wait at the root): the first move, previous_move
+    if it is legal, is searched alone to get a bound, then all the other moves
+    are searched in parallel against that bound. Each worker keeps its own 
+    transposition table between iterations and moves. 
+    Raises SearchTimeout if any root move was not searched before the deadline.
+    """
+    return parallel_root(from_board(board), color, limit, workers, geometry(len(board)), previous_move)
+
+
+def parallel_root(position, color, limit, workers, geo, previous_move=None):
+    """
+    Same as select_move_parallel, for a (dark, light) position.
+    """
+    global worker_pool
+    moves = get_moves(position, color, geo)
+    if not moves:
+        return None, None
+    moves = [move[1] for move in sorted_moves(position, color, moves, geo)]
+    if previous_move is not None and previous_move != (None, None):
+        previous = previous_move[1] * geo.n + previous_move[0]
+        moves.sort(key=lambda move: move != previous)
+
+    if worker_pool is None:
+        worker_pool = Pool(workers)
+    job = (position, color, limit, geo.n, search_deadline)
+    best_score = worker_pool.apply(search_root_move, (job + (moves[0], float('-inf')),))
+    if best_score is None:
+        raise SearchTimeout
+    scores = worker_pool.map(search_root_move, [job + (move, best_score) for move in moves[1:]])
+    if None in scores:
+        raise SearchTimeout
+
+    best_move = moves[0]
+    for move, score in zip(moves[1:], scores):
+        if score > best_score:
+            best_move = move
+            best_score = score
+    return to_move(best_move, geo)
+
+
+def search_root_move(job):
+    """
+    Runs in a worker process: returns the alpha-beta value of the root move
+    in job for a window (alpha, inf), or None if the deadline passed.
+    """
+    global search_deadline, search_generation
+    position, color, limit, n, deadline, move, alpha = job
+    geo = geometry(n)
+    search_generation += 1
+    search_deadline = deadline
+    try:
+        next_move = play(position, color, move, geo)
+        next_key = child_key(zobrist_hash(position, color, geo), position, next_move, color, move, geo)
+        return -alphabeta(next_move, 3 - color, float('-inf'), -alpha, 0, limit, geo, next_key)
+    except SearchTimeout:
+        return None
+    finally:
+        search_deadline = None
+
+
+def sorted_moves(position, color, moves, geo):
     """
     Return the list of moves sorted in descending order of their utility value.
     """
     moves_with_utility_value = []
     for move in moves:
-        new_board_state = play_move(board, color, move[0], move[1])
-        utility_value = compute_utility(new_board_state, color)
+        new_board_state = play(position, color, move, geo)
+        utility_value = evaluate_position(new_board_state, color, geo)
         moves_with_utility_value.append(tuple([utility_value, move, new_board_state]))
     return sorted(moves_with_utility_value, key=lambda x: x[0], reverse=True)
 
 
+############ PONDERING #############################
+#
+# While the opponent thinks, the AI would otherwise sit blocked on input(). 
+# Instead, a background thread predicts the opponent's reply and searches the
+# position after it, filling the transposition table (and the endgame table).
+# When the next board arrives the pondering search is stopped, and if the 
+# prediction was right the real search finds its deepest iterations already
+# in the table. input() releases the GIL, so the two threads do not compete.
+
+PONDER_BUDGET = 3600.0  # Pondering runs until it is stopped (or the game ends).
+
+ponder_thread = None  # The running pondering thread, if any.
+
+
+def ponder(position, color, n):
+    """
+    Predicts the opponent's reply in position (the opponent of color to move) 
+    from the evaluation of its moves, and searches the resulting position for
+    color until it is stopped.
+    """
+    geo = geometry(n)
+    opponent = 3 - color
+    moves = get_moves(position, opponent, geo)
+    if not moves:
+        return
+    predicted = sorted_moves(position, opponent, moves, geo)[0][2]
+    if get_moves(predicted, color, geo):
+        search_position(predicted, color, n, PONDER_BUDGET, workers=0, reset_ordering=False)
+
+
+def start_pondering(position, color, n):
+    global ponder_thread
+    ponder_thread = threading.Thread(target=ponder, args=(position, color, n), daemon=True)
+    ponder_thread.start()
+
+
+def stop_pondering():
+    """
+    Stops the pondering search and waits for its thread to finish. The 
+    deadline is set again until the thread is gone, in case it was between
+    two searches (and about to set a new deadline) when it was first stopped.
+    """
+    global ponder_thread, search_deadline
+    if ponder_thread is None:
+        return
+    while ponder_thread.is_alive():
+        search_deadline = 0
+        ponder_thread.join(0.01)
+    ponder_thread = None
+    search_deadline = None
+
+
 ####################################################
+def update_position(position, n, fields):
+    """
+    Returns the AI's own (dark, light) position and board size after a 
+    compact protocol board line, split into fields: the moves since the 
+    previous line, then the cells if the manager sent them. The cells replace
+    the kept position; otherwise the moves are played on it. The position is
+    None if neither is possible (no kept position, or a move that does not 
+    apply), and the AI then asks the manager for the cells.
+    """
+    if len(fields) > 1:
+        return from_cells(fields[1]), math.isqrt(len(fields[1]))
+    if position is None:
+        return None, n
+    geo = geometry(n)
+    if fields[0] != "-":
+        for move in fields[0].split(";"):
+            player_s, square_s = move.split(":")
+            i_s, j_s = square_s.split(",")
+            player, square = int(player_s), int(j_s) * n + int(i_s)
+            own, opp = position if player == 1 else position[::-1]
+            if not move_mask(own, opp, geo) >> square & 1:
+                return None, n
+            position = play(position, player, square, geo)
+    return position, n
+
+
 def run_ai():
     """
     This function establishes communication with the game manager. 
@@ -190,9 +908,14 @@ def run_ai():
     Then it repeatedly receives the current score and current board state
     until the game is over. 
     """
-    print("nj2387_AI") # First line is the name of this AI
-    color = int(input()) # Then we read the color: 1 for dark (goes first), 
-                         # 2 for light. 
+    print("nj2387_AI\tcompact") # First line is the name of this AI, and the
+                                 # protocol extensions it supports
+    color_line = input().split()
+    color = int(color_line[0]) # Then we read the color: 1 for dark (goes first), 
+                               # 2 for light. 
+    compact = "compact" in color_line[1:]
+    position = None  # Our own (dark, light) copy of the board in the compact
+    n = None         # protocol, and the board size.
 
     while True: # This is the main loop 
         # Read in the current game status, for example:
@@ -203,8 +926,14 @@ def run_ai():
         dark_score = int(dark_score_s)
         light_score = int(light_score_s)
 
+        stop_pondering()
         if status == "FINAL":  # Game is over.
             print 
+        elif compact:
+            position, n = update_position(position, n, input().split())
+            if position is None:
+                print("SYNC", flush=True)  # Ask the manager for the cells.
+                position, n = update_position(position, n, input().split())
         else: 
             board = eval(input()) # Read in the input and turn it into a Python
                                   # object. The format is a list of rows. The 
@@ -212,12 +941,18 @@ def run_ai():
                                   # 0 : empty square
                                   # 1 : dark disk (player 1)
                                   # 2 : light disk (player 2)
+            position, n = from_board(board), len(board)
                     
+        if status != "FINAL":
             # Select the move and send it to the manager 
             # movei, movej = select_move_minimax(board, color)
             # movei, movej = select_move_alphabeta(board, color)
-            movei, movej = select_move_alphabeta(board, color, limit=3)
-            print("{} {}".format(movei, movej)) 
+            # movei, movej = select_move_alphabeta(board, color, limit=3)
+            movei, movej = search_position(position, color, n)
+            write_stats(color, (movei, movej))
+            print("{} {}".format(movei, movej), flush=True) 
+            if PONDER and movei is not None:
+                start_pondering(play(position, color, movej * n + movei, geometry(n)), color, n)
 
 
 if __name__ == "__main__":
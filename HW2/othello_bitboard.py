@@ -0,0 +1,308 @@
+"""
+COMS W4701 Artificial Intelligence - Programming Homework 2
+
+Bitboard move generation for Othello. A position is a (dark, light) pair of
+ints with one bit per square: square (i, j), column i and row j, is bit
+j * n + i. Legal moves and flips are computed for all squares at once with
+shifts and masks instead of walking the 8 directions from every square.
+
+The functions at the bottom of this module have the same interface as the
+ones in othello_shared and can be used as a drop in replacement.
+
+@author: Naman Jain (nj2387)
+"""
+
+DIRECTIONS = ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1))
+
+
+class Geometry(object):
+    """
+    Masks and shifts for an n x n board. For every direction, directions
+    holds the shift that moves each bit to its neighbour in that direction,
+    and the mask of the squares that can be reached that way (so that bits
+    do not wrap around from one edge of the board to the other).
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.size = n * n
+        self.full = (1 << self.size) - 1
+        first_column = sum(1 << (j * n) for j in range(n))
+        last_column = first_column << (n - 1)
+
+        self.directions = []
+        for xdir, ydir in DIRECTIONS:
+            mask = self.full
+            if xdir == 1:
+                mask &= ~first_column
+            elif xdir == -1:
+                mask &= ~last_column
+            self.directions.append((ydir * n + xdir, mask))
+
+        # Masks for the symmetries: the first row and column, and for every
+        # diagonal i - j = d, its squares and the shift (d * (n - 1)) that 
+        # moves them across the main diagonal.
+        self.first_row = (1 << n) - 1
+        self.first_column = first_column
+        self.diagonals = []
+        for d in range(1 - n, n):
+            mask = sum(1 << (j * n + j + d) for j in range(n) if 0 <= j + d < n)
+            self.diagonals.append((d * (n - 1), mask))
+
+        # The 8 symmetries of the square (rotations and reflections), as 
+        # permutations of the squares. symmetries[0] is the identity.
+        self.symmetries = []
+        for transpose in (False, True):
+            for flip_columns in (False, True):
+                for flip_rows in (False, True):
+                    permutation = []
+                    for square in range(self.size):
+                        i, j = square % n, square // n
+                        if transpose:
+                            i, j = j, i
+                        if flip_columns:
+                            i = n - 1 - i
+                        if flip_rows:
+                            j = n - 1 - j
+                        permutation.append(j * n + i)
+                    self.symmetries.append(tuple(permutation))
+        self.inverse_symmetries = []
+        for permutation in self.symmetries:
+            inverse = [0] * self.size
+            for square, image in enumerate(permutation):
+                inverse[image] = square
+            self.inverse_symmetries.append(tuple(inverse))
+
+
+geometries = {}  # For storing the geometry of each board size.
+
+
+def geometry(n):
+    if n not in geometries:
+        geometries[n] = Geometry(n)
+    return geometries[n]
+
+
+def popcount(x):
+    return bin(x).count("1")
+
+
+def squares(x):
+    """
+    Returns the squares of the bits set in x, in increasing order.
+    """
+    result = []
+    while x:
+        low = x & -x
+        result.append(low.bit_length() - 1)
+        x ^= low
+    return result
+
+
+def transform(x, permutation):
+    """
+    Returns the bitboard x with every square moved by permutation.
+    """
+    result = 0
+    for square in squares(x):
+        result |= 1 << permutation[square]
+    return result
+
+
+def flip_rows(x, geo):
+    """
+    Returns x mirrored top to bottom (row j becomes row n - 1 - j).
+    """
+    n = geo.n
+    result = 0
+    for j in range(n):
+        result |= ((x >> (j * n)) & geo.first_row) << ((n - 1 - j) * n)
+    return result
+
+
+def flip_columns(x, geo):
+    """
+    Returns x mirrored left to right (column i becomes column n - 1 - i).
+    """
+    n = geo.n
+    result = 0
+    for i in range(n):
+        result |= ((x >> i) & geo.first_column) << (n - 1 - i)
+    return result
+
+
+def transpose(x, geo):
+    """
+    Returns x mirrored along the main diagonal (square (i, j) becomes (j, i)).
+    """
+    result = 0
+    for shift, mask in geo.diagonals:
+        if shift >= 0:
+            result |= (x & mask) << shift
+        else:
+            result |= (x & mask) >> -shift
+    return result
+
+
+def symmetric_images(x, geo):
+    """
+    Returns the 8 symmetric images of x, in the order of geo.symmetries: 
+    images[k] is transform(x, geo.symmetries[k]), computed with a few shifts
+    and masks per row, column or diagonal instead of one step per disc.
+    """
+    images = []
+    for transposed in (x, transpose(x, geo)):
+        for flipped in (transposed, flip_columns(transposed, geo)):
+            images.append(flipped)
+            images.append(flip_rows(flipped, geo))
+    return images
+
+
+def canonical(position, geo):
+    """
+    Returns the smallest of the 8 symmetric images of a (dark, light) 
+    position, and the index of the symmetry that produces it. Symmetric 
+    positions have the same canonical image.
+    """
+    dark, light = position
+    images = list(zip(symmetric_images(dark, geo), symmetric_images(light, geo)))
+    best = min(images)
+    return best, images.index(best)
+
+
+def move_mask(own, opp, geo):
+    """
+    Returns the mask of all squares the player with discs own can play.
+    For each direction, runs of opponent discs adjacent to own discs are
+    grown one square at a time; an empty square right after a run is a move.
+    """
+    empty = geo.full & ~(own | opp)
+    moves = 0
+    for shift, mask in geo.directions:
+        reachable = opp & mask
+        if shift > 0:
+            line = (own << shift) & reachable
+            for _ in range(geo.n - 3):
+                line |= (line << shift) & reachable
+            moves |= (line << shift) & mask & empty
+        else:
+            shift = -shift
+            line = (own >> shift) & reachable
+            for _ in range(geo.n - 3):
+                line |= (line >> shift) & reachable
+            moves |= (line >> shift) & mask & empty
+    return moves
+
+
+def flip_mask(own, opp, square, geo):
+    """
+    Returns the mask of the opponent discs flipped when the player with
+    discs own plays square.
+    """
+    flips = 0
+    for shift, mask in geo.directions:
+        line = 0
+        if shift > 0:
+            x = (1 << square << shift) & mask
+            while x & opp:
+                line |= x
+                x = (x << shift) & mask
+        else:
+            x = (1 << square >> -shift) & mask
+            while x & opp:
+                line |= x
+                x = (x >> -shift) & mask
+        if x & own:
+            flips |= line
+    return flips
+
+
+def play(position, color, square, geo):
+    """
+    Returns the (dark, light) position after color plays square.
+    """
+    dark, light = position
+    if color == 1:
+        flips = flip_mask(dark, light, square, geo)
+        return dark | flips | (1 << square), light & ~flips
+    flips = flip_mask(light, dark, square, geo)
+    return dark & ~flips, light | flips | (1 << square)
+
+
+def get_moves(position, color, geo):
+    """
+    Returns the squares color can play in position, in increasing order.
+    """
+    dark, light = position
+    if color == 1:
+        return squares(move_mask(dark, light, geo))
+    return squares(move_mask(light, dark, geo))
+
+
+def from_board(board):
+    """
+    Converts a board (rows of 0, 1 and 2) into a (dark, light) position.
+    """
+    dark = 0
+    light = 0
+    bit = 1
+    for row in board:
+        for cell in row:
+            if cell == 1:
+                dark |= bit
+            elif cell == 2:
+                light |= bit
+            bit <<= 1
+    return dark, light
+
+
+def to_board(position, n):
+    """
+    Converts a (dark, light) position into a tuple of tuples board.
+    """
+    dark, light = position
+    board = []
+    for j in range(n):
+        row = []
+        for i in range(n):
+            bit = 1 << (j * n + i)
+            row.append(1 if dark & bit else 2 if light & bit else 0)
+        board.append(tuple(row))
+    return tuple(board)
+
+
+def from_cells(cells):
+    """
+    Converts a string of n * n digits (0, 1 or 2, row by row) into a 
+    (dark, light) position.
+    """
+    dark = 0
+    light = 0
+    for square, cell in enumerate(cells):
+        if cell == "1":
+            dark |= 1 << square
+        elif cell == "2":
+            light |= 1 << square
+    return dark, light
+
+
+############ othello_shared interface ##############
+
+def get_possible_moves(board, player):
+    """
+    Return a list of all possible (column,row) tuples that player can play on
+    the current board, in the same order as othello_shared.
+    """
+    n = len(board)
+    moves = get_moves(from_board(board), player, geometry(n))
+    return sorted((square % n, square // n) for square in moves)
+
+
+def play_move(board, player, i, j):
+    n = len(board)
+    return to_board(play(from_board(board), player, j * n + i, geometry(n)), n)
+
+
+def get_score(board):
+    dark, light = from_board(board)
+    return popcount(dark), popcount(light)
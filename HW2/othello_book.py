@@ -0,0 +1,152 @@
+"""
+COMS W4701 Artificial Intelligence - Programming Homework 2
+
+Opening book for the Othello AI. The generator searches every position
+reachable in the first few plies from the initial board (each only once up
+to rotations and reflections) and stores the best move found. At play time
+the book is loaded on first use and consulted before any search.
+
+Book file: a header (magic, board size), then one record per position: the
+canonical dark and light bitboards, the color to move and the best move in
+the canonical frame, each bitboard in ceil(n * n / 8) little-endian bytes.
+
+Usage: python othello_book.py n plies seconds_per_position [filename]
+
+@author: Naman Jain (nj2387)
+"""
+
+import os
+import struct
+import sys
+import time
+
+from othello_bitboard import canonical, from_board, geometry, get_moves, play, to_board
+
+MAGIC = b'OBK1'
+HEADER = struct.Struct('<4sB')   # magic, board size
+BOOK_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+books = {}  # For storing the loaded books, by filename.
+
+
+def book_file(n):
+    """
+    Returns the default book file for n x n boards.
+    """
+    return os.path.join(BOOK_DIRECTORY, "opening_book_{}.bin".format(n))
+
+
+def initial_position(n):
+    """
+    Returns the position OthelloGameManager.create_initial_board produces.
+    """
+    i = n // 2 - 1
+    light = (1 << (i * n + i)) | (1 << ((i + 1) * n + i + 1))
+    dark = (1 << ((i + 1) * n + i)) | (1 << (i * n + i + 1))
+    return dark, light
+
+
+def book_key(position, color, geo):
+    """
+    Returns the (canonical dark, canonical light, color) key of a position and
+    the index of the symmetry that maps it to its canonical image.
+    """
+    (dark, light), symmetry = canonical(position, geo)
+    return (dark, light, color), symmetry
+
+
+def generate_book(n, plies, time_budget):
+    """
+    Returns the book of every position reachable in at most plies plies from
+    the initial position: a dictionary from book_key to the best move found
+    in time_budget seconds of iterative deepening, in the canonical frame.
+    """
+    from nj2387_ai import select_move_iterative
+
+    geo = geometry(n)
+    book = {}
+    layer = [(initial_position(n), 1)]
+    for _ in range(plies + 1):
+        next_layer = []
+        for position, color in layer:
+            key, symmetry = book_key(position, color, geo)
+            if key in book:
+                continue
+            moves = get_moves(position, color, geo)
+            if not moves:
+                continue
+            i, j = select_move_iterative(to_board(position, n), color, time_budget, use_book=False)
+            book[key] = geo.symmetries[symmetry][j * n + i]
+            next_layer.extend((play(position, color, move, geo), 3 - color) for move in moves)
+        layer = next_layer
+    return book
+
+
+def save_book(filename, n, book):
+    size = (n * n + 7) // 8
+    with open(filename, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, n))
+        for (dark, light, color), move in sorted(book.items()):
+            f.write(dark.to_bytes(size, 'little'))
+            f.write(light.to_bytes(size, 'little'))
+            f.write(bytes((color, move)))
+
+
+def load_book(filename):
+    """
+    Returns (n, book) read from a file written by save_book.
+    """
+    with open(filename, 'rb') as f:
+        data = f.read()
+    magic, n = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("{} is not an opening book file.".format(filename))
+    size = (n * n + 7) // 8
+    book = {}
+    for offset in range(HEADER.size, len(data), 2 * size + 2):
+        dark = int.from_bytes(data[offset:offset + size], 'little')
+        light = int.from_bytes(data[offset + size:offset + 2 * size], 'little')
+        color, move = data[offset + 2 * size], data[offset + 2 * size + 1]
+        book[(dark, light, color)] = move
+    return n, book
+
+
+def lookup(board, color, filename=None):
+    """
+    Returns the book move (column, row) for color on board, or None if the
+    position is not in the book (or there is no book file).
+    """
+    return lookup_position(from_board(board), color, len(board), filename)
+
+
+def lookup_position(position, color, n, filename=None):
+    """
+    Same as lookup, for a (dark, light) position on an n x n board.
+    """
+    if filename is None:
+        filename = book_file(n)
+    if filename not in books:
+        books[filename] = load_book(filename) if os.path.exists(filename) else (None, {})
+    book_n, book = books[filename]
+    if book_n != n or not book:
+        return None
+
+    geo = geometry(n)
+    key, symmetry = book_key(position, color, geo)
+    if key not in book:
+        return None
+    move = geo.inverse_symmetries[symmetry][book[key]]
+    return move % n, move // n
+
+
+if __name__ == "__main__":
+
+    if len(sys.argv) not in (4, 5):
+        print("Usage: python othello_book.py n plies seconds_per_position [filename]")
+    else:
+        n = int(sys.argv[1])
+        start = time.time()
+        book = generate_book(n, int(sys.argv[2]), float(sys.argv[3]))
+        filename = sys.argv[4] if len(sys.argv) == 5 else book_file(n)
+        save_book(filename, n, book)
+        print("{} positions written to {} in {:.1f}s.".format(len(book), filename, time.time() - start))
@@ -0,0 +1,131 @@
+"""
+COMS W4701 Artificial Intelligence - Programming Homework 2
+
+Pattern-based evaluation of Othello positions on bitboards (see
+othello_bitboard). The score of a position, from the perspective of the
+player to move, adds up:
+- the four edges, each looked up in a table indexed by the discs of both
+  players on that edge (corners, discs made stable by an owned corner,
+  C-squares next to an empty corner and other edge discs),
+- X-squares (diagonally next to an empty corner), and
+- mobility, the difference in the number of legal moves.
+The edge tables are computed once per board size, so evaluating a leaf only
+takes a few shifts, masks and lookups.
+
+@author: Naman Jain (nj2387)
+"""
+
+from othello_bitboard import move_mask, popcount
+
+CORNER_WEIGHT = 25
+STABLE_WEIGHT = 6
+EDGE_WEIGHT = 1
+C_SQUARE_WEIGHT = -8
+X_SQUARE_WEIGHT = -12
+MOBILITY_WEIGHT = 3
+
+
+def edge_line_value(own, opp, n):
+    """
+    Returns the value for own of an edge of n squares, given the masks of the
+    own and opponent discs on it (bit k is the k-th square along the edge).
+    """
+    full = (1 << n) - 1
+    value = 0
+    for player, sign in ((own, 1), (opp, -1)):
+        stable = 0
+        if (own | opp) == full:
+            stable = player
+        else:
+            for corner, step in ((0, 1), (n - 1, -1)):
+                k = corner
+                while 0 <= k < n and (player >> k) & 1:
+                    stable |= 1 << k
+                    k += step
+        for k in range(n):
+            if not (player >> k) & 1:
+                continue
+            if k in (0, n - 1):
+                value += sign * CORNER_WEIGHT
+            elif (stable >> k) & 1:
+                value += sign * STABLE_WEIGHT
+            elif (k == 1 and not ((own | opp) & 1)) or (k == n - 2 and not ((own | opp) >> (n - 1)) & 1):
+                value += sign * C_SQUARE_WEIGHT
+            else:
+                value += sign * EDGE_WEIGHT
+    return value
+
+
+class EvaluationTables(object):
+    """
+    Precomputed masks and edge table for an n x n board (see Geometry).
+    edge_values[own << n | opp] is edge_line_value(own, opp, n).
+    """
+
+    def __init__(self, geo):
+        n = geo.n
+        self.geo = geo
+        self.n = n
+        self.row_mask = (1 << n) - 1
+        self.bottom_shift = n * (n - 1)
+        self.first_column = sum(1 << (j * n) for j in range(n))
+
+        # Multiplying the bits of the first column by column_magic moves bit
+        # j * n to bit column_shift + j, and no two partial products overlap.
+        self.column_shift = (n - 1) * (n - 1)
+        self.column_magic = sum(1 << (self.column_shift - k * (n - 1)) for k in range(n))
+
+        self.edge_values = [0] * (1 << (2 * n))
+        for own in range(1 << n):
+            for opp in range(1 << n):
+                if not own & opp:
+                    self.edge_values[own << n | opp] = edge_line_value(own, opp, n)
+
+        # (corner, X-square) masks
+        last = n - 1
+        self.x_squares = [(1 << (j * n + i), 1 << ((j + dj) * n + i + di))
+                          for i, j, di, dj in ((0, 0, 1, 1), (last, 0, -1, 1), (0, last, 1, -1), (last, last, -1, -1))]
+
+    def column(self, x):
+        return (((x & self.first_column) * self.column_magic) >> self.column_shift) & self.row_mask
+
+    def edges(self, x):
+        """
+        Returns the four edges of x (top, bottom, left, right) as n-bit lines.
+        """
+        n = self.n
+        return (x & self.row_mask, x >> self.bottom_shift, self.column(x), self.column(x >> (n - 1)))
+
+
+evaluation_tables = {}  # For storing the evaluation tables of each board size.
+
+
+def tables(geo):
+    if geo.n not in evaluation_tables:
+        evaluation_tables[geo.n] = EvaluationTables(geo)
+    return evaluation_tables[geo.n]
+
+
+def evaluate(own, opp, geo):
+    """
+    Returns the heuristic value of the position for the player with discs own,
+    who is to move.
+    """
+    t = tables(geo)
+    n = t.n
+    edge_values = t.edge_values
+
+    score = 0
+    for own_line, opp_line in zip(t.edges(own), t.edges(opp)):
+        score += edge_values[own_line << n | opp_line]
+
+    empty = geo.full & ~(own | opp)
+    for corner, x_square in t.x_squares:
+        if empty & corner:
+            if own & x_square:
+                score += X_SQUARE_WEIGHT
+            elif opp & x_square:
+                score -= X_SQUARE_WEIGHT
+
+    score += MOBILITY_WEIGHT * (popcount(move_mask(own, opp, geo)) - popcount(move_mask(opp, own, geo)))
+    return score
@@ -8,8 +8,12 @@ players.
 
 @author: Daniel Bauer 
 """
+import importlib.util
+import inspect
+import os
 import sys
 import subprocess
+import time
 from threading import Timer
 from othello_shared import find_lines, get_possible_moves, play_move, get_score
 
@@ -30,16 +34,32 @@ class Player(object):
         pass  
 
 class AiPlayerInterface(Player):
+    """
+    An AI running in its own process, talking to the manager over stdin and 
+    stdout. An AI can list protocol extensions after a tab on the line that
+    introduces it. If it lists "compact" (and compact is True), the manager 
+    answers "<color> compact" and then sends each board as one line: the 
+    moves played since the previous request as "color:i,j" separated by ";"
+    (or "-" for none), so the AI can keep its own board. The first line also
+    has the cells in row-major order as digits, after the moves. An AI whose
+    board is out of sync can answer "SYNC" instead of a move, and is sent 
+    "- cells" before it answers again. Otherwise the board is sent as a 
+    Python literal. 
+    """
 
     TIMEOUT = 10 
 
-    def __init__(self, filename, color):
+    def __init__(self, filename, color, compact=True):
         self.color = color
         self.process = subprocess.Popen(['python',filename], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
-        name = self.process.stdout.readline().decode("ASCII").strip()
+        name, _, extensions = self.process.stdout.readline().decode("ASCII").strip().partition("\t")
         print("AI introduced itself as: {}".format(name))
         self.name = name
-        self.process.stdin.write((str(color)+"\n").encode("ASCII"))
+        self.compact = compact and "compact" in extensions.split()
+        self.moves_sent = 0
+        self.synchronized = False  # Whether the AI has been sent the cells.
+        color_line = "{} compact".format(color) if self.compact else str(color)
+        self.process.stdin.write((color_line+"\n").encode("ASCII"))
         self.process.stdin.flush()
 
     def timeout(self): 
@@ -51,7 +71,17 @@ class AiPlayerInterface(Player):
         white_score, dark_score = get_score(manager.board)
         self.process.stdin.write("SCORE {} {}\n".format(white_score, dark_score).encode("ASCII"))
         self.process.stdin.flush()
-        self.process.stdin.write("{}\n".format(str(manager.board)).encode("ASCII"))
+        cells = "".join(str(cell) for row in manager.board for cell in row)
+        if self.compact:
+            moves = ";".join("{}:{},{}".format(*move) for move in manager.history[self.moves_sent:]) or "-"
+            self.moves_sent = len(manager.history)
+            if self.synchronized:
+                self.process.stdin.write("{}\n".format(moves).encode("ASCII"))
+            else:
+                self.process.stdin.write("{} {}\n".format(moves, cells).encode("ASCII"))
+                self.synchronized = True
+        else:
+            self.process.stdin.write("{}\n".format(str(manager.board)).encode("ASCII"))
         self.process.stdin.flush()
 
         timer = Timer(AiPlayerInterface.TIMEOUT, lambda: self.timeout())
@@ -60,6 +90,10 @@ class AiPlayerInterface(Player):
 
         # Wait for the AI call
         move_s = self.process.stdout.readline().decode("ASCII") 
+        if self.compact and move_s.strip() == "SYNC" and not self.timed_out:
+            self.process.stdin.write("- {}\n".format(cells).encode("ASCII"))
+            self.process.stdin.flush()
+            move_s = self.process.stdout.readline().decode("ASCII") 
 
         if self.timed_out:  
             raise AiTimeoutError
@@ -75,6 +109,60 @@ class AiPlayerInterface(Player):
         self.process.kill() 
 
 
+class InProcessPlayer(Player):
+    """
+    An AI module loaded into the manager's process. Each move calls the 
+    module's select_move(board, color) function directly, without a process,
+    pipes or a timer. If the function takes a deadline argument, it is passed
+    the time.time() by which it must return; a move returned after TIMEOUT 
+    seconds counts as a timeout, as for AiPlayerInterface. Every instance 
+    loads its own copy of the module, so two players never share state.
+    """
+
+    TIMEOUT = AiPlayerInterface.TIMEOUT
+
+    def __init__(self, filename, color, function="select_move"):
+        self.color = color
+        directory, basename = os.path.split(os.path.abspath(filename))
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+        module_name = "{}_player{}".format(os.path.splitext(basename)[0], color)
+        spec = importlib.util.spec_from_file_location(module_name, filename)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+        self.name = os.path.splitext(basename)[0]
+        self.select_move = getattr(module, function)
+        self.takes_deadline = "deadline" in inspect.signature(self.select_move).parameters
+
+    def get_move(self, manager):
+        board = tuple(tuple(row) for row in manager.board)
+        deadline = time.time() + InProcessPlayer.TIMEOUT
+        if self.takes_deadline:
+            i, j = self.select_move(board, self.color, deadline=deadline)
+        else:
+            i, j = self.select_move(board, self.color)
+        if time.time() > deadline:
+            raise AiTimeoutError
+        return i, j
+
+    def kill(self, manager):
+        pass
+
+
+AI_PLAYERS = (AiPlayerInterface, InProcessPlayer)
+
+
+def ai_player(filename, color, in_process=False):
+    """
+    Returns the player for the AI in filename: an InProcessPlayer if 
+    in_process, else an AiPlayerInterface running it in its own process.
+    """
+    if in_process:
+        return InProcessPlayer(filename, color)
+    return AiPlayerInterface(filename, color)
+
+
 class OthelloGameManager(object):
 
     def __init__(self, dimension = 6):
@@ -82,6 +170,7 @@ class OthelloGameManager(object):
         self.dimension = dimension
         self.board = self.create_initial_board()
         self.current_player = 1
+        self.history = []  # (player, i, j) of every move played
             
     def create_initial_board(self):
         board = []
@@ -115,6 +204,7 @@ class OthelloGameManager(object):
            raise InvalidMoveError("Invalid Move.")
      
         self.board = play_move(self.board, self.current_player, i, j) 
+        self.history.append((self.current_player, i, j))
         self.current_player = 1 if self.current_player == 2 else 2
 
     def get_possible_moves(self):
@@ -140,6 +230,7 @@ def play_game(game, player1, player2):
                 print("{} ({}) plays {},{}".format(player_obj.name, color, i,j))
                 game.play(i,j)
             except AiTimeoutError:
+                p1score, p2score = get_score(game.board)
                 print("{} ({}) timed out!".format(player_obj.name, color))
                 print("FINAL: {} (dark) {}:{} {} (light)".format(player_obj.name, p1score, p2score, player2.name))
                 player1.kill(game)
@@ -153,10 +244,13 @@ def play_game(game, player1, player2):
 if __name__ == "__main__":
 
 
-    if not len(sys.argv) == 3: 
-        print("Usage: python othello_game [p1_ai1.py] [p2_ai2.py]")
+    # -i runs the AIs in this process (see InProcessPlayer).
+    in_process = "-i" in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != "-i"]
+    if not len(args) == 2: 
+        print("Usage: python othello_game [-i] [p1_ai1.py] [p2_ai2.py]")
     else:
-        player1 = AiPlayerInterface(sys.argv[1],1)
-        player2 = AiPlayerInterface(sys.argv[2],2)
+        player1 = ai_player(args[0], 1, in_process)
+        player2 = ai_player(args[1], 2, in_process)
         game = OthelloGameManager(dimension=4)
         play_game(game, player1, player2)
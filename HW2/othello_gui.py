@@ -10,7 +10,7 @@ This module contains a simple graphical user interface for Othello.
 from tkinter import *
 from tkinter import scrolledtext
 
-from othello_game import OthelloGameManager, AiPlayerInterface, Player, InvalidMoveError, AiTimeoutError
+from othello_game import OthelloGameManager, Player, InvalidMoveError, AiTimeoutError, AI_PLAYERS, ai_player
 from othello_shared import get_possible_moves, get_score
 
 class OthelloGui(object):
@@ -55,7 +55,7 @@ class OthelloGui(object):
             self.draw_board()
             if not get_possible_moves(self.game.board, self.game.current_player):
                 self.shutdown("Game Over")
-            elif isinstance(self.players[self.game.current_player], AiPlayerInterface):
+            elif isinstance(self.players[self.game.current_player], AI_PLAYERS):
                 self.root.unbind("<Button-1>")
                 self.root.after(100,lambda: self.ai_move())
         except InvalidMoveError:
@@ -64,9 +64,9 @@ class OthelloGui(object):
     def shutdown(self, text):
         self.move_label["text"] = text 
         self.root.unbind("<Button-1>")
-        if isinstance(self.players[1], AiPlayerInterface): 
+        if isinstance(self.players[1], AI_PLAYERS): 
             self.players[1].kill(self.game)
-        if isinstance(self.players[2], AiPlayerInterface): 
+        if isinstance(self.players[2], AI_PLAYERS): 
             self.players[2].kill(self.game)
  
     def ai_move(self):
@@ -80,7 +80,7 @@ class OthelloGui(object):
             self.draw_board()
             if not get_possible_moves(self.game.board, self.game.current_player):
                 self.shutdown("Game Over")
-            elif isinstance(self.players[self.game.current_player], AiPlayerInterface):
+            elif isinstance(self.players[self.game.current_player], AI_PLAYERS):
                 self.root.after(1, lambda: self.ai_move())
             else: 
                 self.root.bind("<Button-1>",lambda e: self.mouse_pressed(e))        
@@ -88,7 +88,7 @@ class OthelloGui(object):
             self.shutdown("Game Over, {} lost (timeout)".format(player_obj.name))
 
     def run(self):
-        if isinstance(self.players[1], AiPlayerInterface):
+        if isinstance(self.players[1], AI_PLAYERS):
             self.root.after(10, lambda: self.ai_move())
         else: 
             self.root.bind("<Button-1>",lambda e: self.mouse_pressed(e))        
@@ -127,12 +127,15 @@ class OthelloGui(object):
 
 def main():
     
-    if len(sys.argv) == 3:
-        p1 = AiPlayerInterface(sys.argv[1],1)
-        p2 = AiPlayerInterface(sys.argv[2],2)
-    elif len(sys.argv) == 2:
+    # -i runs the AIs in this process (see InProcessPlayer).
+    in_process = "-i" in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != "-i"]
+    if len(args) == 2:
+        p1 = ai_player(args[0], 1, in_process)
+        p2 = ai_player(args[1], 2, in_process)
+    elif len(args) == 1:
         p1 = Player(1)
-        p2 = AiPlayerInterface(sys.argv[1],2)
+        p2 = ai_player(args[0], 2, in_process)
     else: 
         p1 = Player(1)
         p2 = Player(2)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+COMS W4701 Artificial Intelligence - Programming Homework 2
+
+Perft for Othello move generators: counts the positions reachable in exactly
+depth plies from the initial board, and the time it takes. A player without
+moves passes, which counts as a ply; when neither player can move the game
+is over and the position counts as a leaf. The counts check move generation
+(they are known for 8 x 8 boards) and the timings compare generators.
+
+Generators:
+- shared: get_possible_moves and play_move of othello_shared (the reference),
+- bitboard_shared: the same interface in othello_bitboard,
+- bitboard: move_mask and flip_mask on bitboards directly,
+- any other module with the othello_shared interface, given with --module.
+
+--verify walks the game tree of every generator in lockstep with the
+reference and reports the first position where their moves or resulting
+boards differ.
+
+Usage: python othello_perft.py [--n 4 6 8] [--depth 6]
+           [--generators shared bitboard] [--module name] [--verify]
+
+@author: Naman Jain (nj2387)
+"""
+
+import argparse
+import importlib
+import sys
+import time
+
+import othello_bitboard
+import othello_shared
+
+from othello_bitboard import flip_mask, from_board, geometry, move_mask
+
+# Perft counts from the initial 8 x 8 board, by depth.
+KNOWN_COUNTS = {8: [1, 4, 12, 56, 244, 1396, 8200, 55092, 390216]}
+
+
+def initial_board(n):
+    """
+    Returns the initial board OthelloGameManager creates, as a tuple of tuples.
+    """
+    board = [[0] * n for _ in range(n)]
+    i = n // 2 - 1
+    board[i][i] = 2
+    board[i + 1][i + 1] = 2
+    board[i + 1][i] = 1
+    board[i][i + 1] = 1
+    return tuple(tuple(row) for row in board)
+
+
+def perft_module(module, board, color, depth, passed=False):
+    """
+    Returns the number of leaves depth plies below board, color to move,
+    using the get_possible_moves and play_move functions of module.
+    """
+    if depth == 0:
+        return 1
+    moves = module.get_possible_moves(board, color)
+    if not moves:
+        if passed:
+            return 1
+        return perft_module(module, board, 3 - color, depth - 1, True)
+    nodes = 0
+    for i, j in moves:
+        nodes += perft_module(module, module.play_move(board, color, i, j), 3 - color, depth - 1)
+    return nodes
+
+
+def perft_bitboard(own, opp, depth, geo, passed=False):
+    """
+    Same as perft_module, on the bitboards of the player to move (own) and
+    of the opponent.
+    """
+    if depth == 0:
+        return 1
+    moves = move_mask(own, opp, geo)
+    if not moves:
+        if passed:
+            return 1
+        return perft_bitboard(opp, own, depth - 1, geo, True)
+    if depth == 1:
+        return othello_bitboard.popcount(moves)
+    nodes = 0
+    while moves:
+        low = moves & -moves
+        moves ^= low
+        flips = flip_mask(own, opp, low.bit_length() - 1, geo)
+        nodes += perft_bitboard(opp & ~flips, own | flips | low, depth - 1, geo)
+    return nodes
+
+
+def module_generator(module):
+    return lambda board, depth: perft_module(module, board, 1, depth)
+
+
+def bitboard_generator(board, depth):
+    dark, light = from_board(board)
+    return perft_bitboard(dark, light, depth, geometry(len(board)))
+
+
+GENERATORS = {
+    'shared': module_generator(othello_shared),
+    'bitboard_shared': module_generator(othello_bitboard),
+    'bitboard': bitboard_generator,
+}
+
+
+def verify(module, board, color, depth, reference=othello_shared, passed=False):
+    """
+    Walks the game tree below board in lockstep with reference and returns a
+    description of the first difference between the moves or the boards
+    module and reference produce, or None if there is none.
+    """
+    if depth == 0:
+        return None
+    moves = sorted(module.get_possible_moves(board, color))
+    expected = sorted(reference.get_possible_moves(board, color))
+    if moves != expected:
+        return "moves of player {} on {}: {} instead of {}".format(color, board, moves, expected)
+    if not moves:
+        if passed:
+            return None
+        return verify(module, board, 3 - color, depth - 1, reference, True)
+    for i, j in moves:
+        child = tuple(tuple(row) for row in module.play_move(board, color, i, j))
+        expected_child = tuple(tuple(row) for row in reference.play_move(board, color, i, j))
+        if child != expected_child:
+            return "player {} playing {},{} on {}: {} instead of {}".format(color, i, j, board, child, expected_child)
+        difference = verify(module, expected_child, 3 - color, depth - 1, reference)
+        if difference is not None:
+            return difference
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count and time Othello move generation.")
+    parser.add_argument('--n', type=int, nargs='+', default=[4, 6, 8])
+    parser.add_argument('--depth', type=int, default=6)
+    parser.add_argument('--generators', nargs='+', choices=sorted(GENERATORS), default=sorted(GENERATORS))
+    parser.add_argument('--module', action='append', default=[],
+                        help="also test a module with the othello_shared interface")
+    parser.add_argument('--verify', action='store_true', help="compare every generator with the reference")
+    args = parser.parse_args()
+
+    generators = {name: GENERATORS[name] for name in args.generators}
+    modules = {'bitboard_shared': othello_bitboard}
+    for name in args.module:
+        modules[name] = importlib.import_module(name)
+        generators[name] = module_generator(modules[name])
+
+    failed = False
+    print("{:>3} {:>5} {:<16} {:>12} {:>10} {:>12}".format("n", "depth", "generator", "nodes", "seconds", "nodes/s"))
+    for n in args.n:
+        board = initial_board(n)
+        for depth in range(1, args.depth + 1):
+            counts = {}
+            for name, generator in generators.items():
+                start = time.perf_counter()
+                counts[name] = generator(board, depth)
+                elapsed = time.perf_counter() - start
+                print("{:>3} {:>5} {:<16} {:>12} {:>10.3f} {:>12.0f}".format(
+                    n, depth, name, counts[name], elapsed, counts[name] / elapsed if elapsed else 0))
+            known = KNOWN_COUNTS.get(n)
+            if known is not None and depth < len(known):
+                counts['known'] = known[depth]
+            if len(set(counts.values())) > 1:
+                print("MISMATCH: {}".format(counts))
+                failed = True
+
+        if args.verify:
+            for name, module in modules.items():
+                if name not in generators:
+                    continue
+                difference = verify(module, board, 1, args.depth)
+                print("verify {} {}x{} depth {}: {}".format(name, n, n, args.depth, difference or "ok"))
+                failed = failed or difference is not None
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+COMS W4701 Artificial Intelligence - Programming Homework 2
+
+Headless tournament runner for Othello AIs. Plays a match of N games between
+two AI scripts, or a round robin of N games between every pair of several
+scripts (by default every *_ai.py in this directory), on a pool of worker
+processes. Games are played in pairs from the same random opening, once with
+each color. Reports win rates, Elo ratings and per-move latencies, and can
+write one CSV row per game.
+
+Usage: python othello_tournament.py [ai1.py ai2.py ...] [--games 10]
+           [--dimension 4] [--opening-plies 4] [--workers 4] [--seed 0]
+           [--time-budget seconds] [--ponder] [--in-process]
+           [--output games.csv]
+
+@author: Naman Jain (nj2387)
+"""
+
+import argparse
+import csv
+import glob
+import itertools
+import math
+import os
+import random
+import sys
+import time
+
+from contextlib import redirect_stdout
+from multiprocessing import Pool
+
+from othello_game import AiTimeoutError, InvalidMoveError, OthelloGameManager, ai_player
+from othello_shared import get_score
+
+FIELDS = ['index', 'dark', 'light', 'opening', 'dark_score', 'light_score', 'winner', 'forfeit', 'moves']
+
+AI_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def random_opening(dimension, plies, rng):
+    """
+    Returns a list of plies random legal (column, row) moves from the initial
+    board (fewer if the game ends before).
+    """
+    game = OthelloGameManager(dimension)
+    opening = []
+    for _ in range(plies):
+        moves = game.get_possible_moves()
+        if not moves:
+            break
+        i, j = rng.choice(moves)
+        game.play(i, j)
+        opening.append((i, j))
+    return opening
+
+
+def play_tournament_game(job):
+    """
+    Plays one game without printing anything and returns a dictionary of
+    FIELDS plus the move latencies (in seconds) of both players. job is an
+    (index, dark, light, dimension, opening, in_process) tuple, where dark and
+    light are AI script filenames, run in this process if in_process (see
+    InProcessPlayer in othello_game). An AI that times out, crashes or plays an illegal
+    move forfeits the game.
+    """
+    index, dark, light, dimension, opening, in_process = job
+    game = OthelloGameManager(dimension)
+    for i, j in opening:
+        game.play(i, j)
+
+    latencies = {1: [], 2: []}
+    forfeit = None
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        players = [None, ai_player(dark, 1, in_process), ai_player(light, 2, in_process)]
+    try:
+        while game.get_possible_moves():
+            start = time.perf_counter()
+            i, j = players[game.current_player].get_move(game)
+            latencies[game.current_player].append(time.perf_counter() - start)
+            game.play(i, j)
+    except (AiTimeoutError, InvalidMoveError, ValueError, IndexError):
+        forfeit = game.current_player
+    finally:
+        for player in players[1:]:
+            try:
+                player.kill(game)
+            except OSError:
+                pass
+
+    dark_score, light_score = get_score(game.board)
+    if forfeit is not None:
+        winner = 3 - forfeit
+    else:
+        winner = 1 if dark_score > light_score else 2 if light_score > dark_score else 0
+    return {
+        'index': index,
+        'dark': dark,
+        'light': light,
+        'opening': " ".join("{},{}".format(i, j) for i, j in opening),
+        'dark_score': dark_score,
+        'light_score': light_score,
+        'winner': winner,
+        'forfeit': forfeit,
+        'moves': len(game.history),
+        'latencies': latencies,
+    }
+
+
+def schedule(players, games, dimension, opening_plies, seed=0, in_process=False):
+    """
+    Returns the jobs of a round robin of games games between every pair of
+    players (a match if there are only two). Games 2k and 2k + 1 of a pair
+    start from the same random opening with the colors swapped.
+    """
+    jobs = []
+    for first, second in itertools.combinations(players, 2):
+        for game in range(games):
+            rng = random.Random(seed * 1000003 + game // 2)
+            opening = random_opening(dimension, opening_plies, rng)
+            dark, light = (first, second) if game % 2 == 0 else (second, first)
+            jobs.append((len(jobs), dark, light, dimension, opening, in_process))
+    return jobs
+
+
+def elo_ratings(results, players, iterations=1000):
+    """
+    Returns the Elo ratings (mean 0) that best explain the results, fitted by
+    gradient ascent on the likelihood of the logistic Elo model. Every player
+    is also given one draw against a player rated 0, so that the ratings of
+    players who won or lost every game stay finite.
+    """
+    ratings = dict.fromkeys(players, 0.0)
+    for _ in range(iterations):
+        for player in players:
+            actual = 0.5
+            expected = expected_score(ratings[player], 0.0)
+            count = 1
+            for result in results:
+                if player in (result['dark'], result['light']):
+                    opponent = result['light'] if player == result['dark'] else result['dark']
+                    actual += game_score(result, player)
+                    expected += expected_score(ratings[player], ratings[opponent])
+                    count += 1
+            ratings[player] += 400 * (actual - expected) / count
+    mean = sum(ratings.values()) / len(ratings)
+    return {player: rating - mean for player, rating in ratings.items()}
+
+
+def expected_score(rating, opponent_rating):
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / 400))
+
+
+def game_score(result, player):
+    """
+    Returns 1, 0.5 or 0 for a win, draw or loss of player in result.
+    """
+    if result['winner'] == 0:
+        return 0.5
+    color = 1 if player == result['dark'] else 2
+    return 1.0 if result['winner'] == color else 0.0
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def summary(results, players):
+    """
+    Returns a text table with, for every player, its games, wins, draws,
+    losses, score, Elo rating and move latencies, best rated first.
+    """
+    ratings = elo_ratings(results, players)
+    lines = ["{:<20} {:>5} {:>5} {:>5} {:>6} {:>7} {:>7} {:>9} {:>9} {:>9}".format(
+        "player", "games", "wins", "draws", "losses", "score", "elo", "mean ms", "p95 ms", "max ms")]
+    for player in sorted(players, key=lambda p: -ratings[p]):
+        scores = []
+        latencies = []
+        for result in results:
+            for color, name in ((1, result['dark']), (2, result['light'])):
+                if name == player:
+                    scores.append(game_score(result, player))
+                    latencies.extend(result['latencies'][color])
+        mean = 1000 * sum(latencies) / len(latencies) if latencies else math.nan
+        p95 = 1000 * percentile(latencies, 0.95) if latencies else math.nan
+        worst = 1000 * max(latencies) if latencies else math.nan
+        lines.append("{:<20} {:>5} {:>5} {:>5} {:>6} {:>6.1f}% {:>+7.0f} {:>9.1f} {:>9.1f} {:>9.1f}".format(
+            os.path.basename(player), len(scores), scores.count(1.0), scores.count(0.5), scores.count(0.0),
+            100 * sum(scores) / len(scores) if scores else 0, ratings[player], mean, p95, worst))
+    return "\n".join(lines)
+
+
+def run_tournament(players, games=10, dimension=4, opening_plies=4, workers=None, seed=0, in_process=False):
+    """
+    Plays the round robin (see schedule) on workers processes and returns the
+    results of the games in order. workers=None uses one process per CPU;
+    workers=1 plays the games in this process.
+    """
+    jobs = schedule(players, games, dimension, opening_plies, seed, in_process)
+    if workers == 1:
+        return [play_tournament_game(job) for job in jobs]
+    with Pool(workers) as pool:
+        return sorted(pool.imap_unordered(play_tournament_game, jobs), key=lambda result: result['index'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a tournament between Othello AIs.")
+    parser.add_argument('players', nargs='*', help="AI scripts (default: every *_ai.py next to this file)")
+    parser.add_argument('--games', type=int, default=10, help="games between every pair of players")
+    parser.add_argument('--dimension', type=int, default=4)
+    parser.add_argument('--opening-plies', type=int, default=4, help="random moves played before the AIs take over")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--time-budget', type=float, help="sets OTHELLO_TIME_BUDGET for the AIs")
+    parser.add_argument('--ponder', action='store_true', help="let the AIs ponder (they share the CPUs)")
+    parser.add_argument('--in-process', action='store_true', help="run the AIs inside the worker processes")
+    parser.add_argument('--output', help="CSV file to write one row per game to")
+    args = parser.parse_args()
+
+    players = args.players or sorted(glob.glob(os.path.join(AI_DIRECTORY, "*_ai.py")))
+    if len(players) < 2:
+        parser.error("at least two players are needed")
+    if len(set(players)) != len(players):
+        parser.error("every player must be a different script")
+
+    # The AIs read these when they start (or are loaded, with --in-process).
+    if args.time_budget is not None:
+        os.environ["OTHELLO_TIME_BUDGET"] = str(args.time_budget)
+    if not args.ponder:
+        os.environ["OTHELLO_PONDER"] = "0"
+
+    start = time.time()
+    results = run_tournament(players, args.games, args.dimension, args.opening_plies, args.workers, args.seed,
+                             args.in_process)
+    end = time.time()
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(results)
+    print(summary(results, players))
+    sys.stderr.write("Played {} games in {:.1f}s.\n".format(len(results), end - start))
+
+
+if __name__ == "__main__":
+    main()